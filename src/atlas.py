@@ -0,0 +1,188 @@
+"""글자 마스크 아틀라스
+
+폰트 하나와 여러 크기에 대해 레이블 글자들을 미리 래스터화해 파일 하나에 담습니다.
+파일은 `np.memmap`으로 열리므로 워커는 FreeType 없이 바로 마스크를 읽을 수 있습니다.
+
+파일은 `src.data.container` 형식을 따릅니다:
+    - 매직 `DDATLAS1`
+    - JSON 헤더 (폰트 이름, 글자마다 크기/오프셋/bbox/길이/데이터 위치)
+    - `np.packbits` 마스크 데이터
+
+예시:
+    `PYTHONPATH=. python -m src.atlas --font resources/malgun.ttf \\
+        --text a-zA-Z0-9 --percent 0.2 0.4 0.6 --output resources/malgun.atlas`
+"""
+
+from __future__ import annotations
+from typing import Iterable
+from numpy.typing import NDArray
+import numpy as np
+import argparse
+import os
+import re
+import string
+from src.data.container import read_header, write_container
+from src.font import load_font, preload_metrics, text_bbox, text_length
+from src.glyph import GLYPH_CACHE, Glyph, rasterize
+from src.utils import get_sized_fonts
+
+MAGIC = b"DDATLAS1"
+
+
+def font_name(path: str) -> str:
+    """아틀라스에서 폰트를 구분하는 이름. 노드마다 경로가 달라도 되도록 파일 이름만 씁니다."""
+    return os.path.basename(path)
+
+
+class GlyphAtlas:
+    def __init__(self, path: str):
+        """미리 래스터화한 글자 마스크 파일을 메모리 맵으로 엽니다.
+
+        Args:
+            path (str): `save_atlas`로 만든 파일 경로
+        """
+        header, offset = read_header(path, MAGIC)
+
+        self.path = path
+        self.font = header["font"]
+        # 이 아틀라스로 그릴 폰트 경로들. `register`로 등록합니다.
+        self.font_paths: set[str] = set()
+        self.data = np.memmap(path, dtype=np.uint8, mode="r", offset=offset)
+        self.entries: dict[tuple[str, int], dict] = {
+            (entry["text"], entry["size"]): entry for entry in header["glyphs"]
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        return key in self.entries
+
+    def covers(self, path: str) -> bool:
+        """`path` 폰트의 글자를 담고 있는지 확인합니다."""
+        return path in self.font_paths
+
+    def register(self, font_path: str):
+        """`font_path` 폰트를 이 아틀라스에서 읽도록 등록하고 글자 크기를 캐시에 넣습니다.
+
+        아틀라스에는 파일 이름만 적혀 있으므로, 같은 이름의 다른 폰트를 등록하지 않도록
+        `load_font`에 넘길 경로 그대로 등록해야 합니다.
+        """
+        if font_name(font_path) != self.font:
+            raise ValueError(f"atlas {self.path} holds {self.font}, not {font_path}")
+        self.font_paths.add(font_path)
+        self.preload_metrics(font_path)
+
+    def glyph(self, text: str, size: int) -> Glyph | None:
+        """`size` 크기의 `text` 마스크를 반환합니다. 없으면 `None`을 반환합니다."""
+        entry = self.entries.get((text, size))
+        if entry is None:
+            return None
+
+        height, width = entry["shape"]
+        packed = self.data[entry["start"] : entry["start"] + entry["nbytes"]]
+        mask = np.unpackbits(packed, count=height * width).reshape(height, width)
+        return Glyph(mask=mask.astype(np.bool_), offset=tuple(entry["offset"]))
+
+    def preload_metrics(self, font_path: str):
+        """담긴 글자의 bbox와 길이를 `font_path` 폰트의 캐시에 미리 넣어 둡니다."""
+        for (text, size), entry in self.entries.items():
+            preload_metrics(
+                font_path, size, text, tuple(entry["bbox"]), entry["length"]
+            )
+
+
+def save_atlas(path: str, font_path: str, glyphs: Iterable[tuple[str, int]]):
+    """`font_path` 폰트로 `(글자, 크기)`마다 래스터화해 `path`에 저장합니다."""
+    entries = []
+    chunks: list[NDArray[np.uint8]] = []
+    start = 0
+
+    for text, size in sorted(set(glyphs), key=lambda glyph: (glyph[1], glyph[0])):
+        font = load_font(font_path, size)
+        glyph = rasterize(text, font)
+        packed = np.packbits(glyph.mask.reshape(-1))
+        entries.append(
+            {
+                "text": text,
+                "size": size,
+                "shape": list(glyph.mask.shape),
+                "offset": list(glyph.offset),
+                "bbox": list(text_bbox(text, font)),
+                "length": text_length(text, font),
+                "start": start,
+                "nbytes": int(packed.size),
+            }
+        )
+        chunks.append(packed)
+        start += packed.size
+
+    header = {"font": font_name(font_path), "glyphs": entries}
+    write_container(path, MAGIC, header, chunks)
+
+
+def use_atlas(path: str, font_paths: Iterable[str] = ()) -> GlyphAtlas:
+    """아틀라스를 열어 프로세스 전체의 글자 캐시와 폰트 캐시가 읽도록 등록합니다.
+
+    Args:
+        path (str): 아틀라스 경로
+        font_paths (Iterable[str]): 이 아틀라스로 그릴 폰트 경로들. 나중에
+            `GlyphAtlas.register`로 더 등록할 수 있습니다.
+    """
+    atlas = GlyphAtlas(path)
+    for font_path in font_paths:
+        atlas.register(font_path)
+    GLYPH_CACHE.attach(atlas)
+    return atlas
+
+
+def expand_charset(spec: str) -> list[str]:
+    """`a-zA-Z0-9` 같은 범위 표기를 글자 목록으로 펼칩니다."""
+    chars: list[str] = []
+    for match in re.finditer(r"(.)-(.)|(.)", spec):
+        if match.group(3) is not None:
+            chars.append(match.group(3))
+        else:
+            first, last = match.group(1), match.group(2)
+            chars.extend(chr(c) for c in range(ord(first), ord(last) + 1))
+    return list(dict.fromkeys(chars))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="글자 마스크 아틀라스를 만듭니다.")
+    parser.add_argument("--font", required=True, help="트루타입 폰트 경로")
+    parser.add_argument("--output", required=True, help="저장할 아틀라스 경로")
+    parser.add_argument(
+        "--text",
+        default=string.ascii_letters + string.digits,
+        help="담을 글자. `a-zA-Z0-9`처럼 범위로 적을 수 있습니다.",
+    )
+    parser.add_argument("--size", type=int, nargs="*", default=[], help="폰트 크기")
+    parser.add_argument(
+        "--percent",
+        type=float,
+        nargs="*",
+        default=[],
+        help="`get_sized_fonts`의 글자 폭 비율. 글자마다 크기가 달라집니다.",
+    )
+    parser.add_argument("--width", type=int, default=224, help="영상 너비")
+    args = parser.parse_args()
+
+    glyphs: set[tuple[str, int]] = set()
+    for text in expand_charset(args.text):
+        glyphs.update((text, size) for size in args.size)
+        if args.percent:
+            # get_sized_fonts가 기준으로 재는 100pt 크기도 함께 담습니다.
+            glyphs.add((text, 100))
+        for percent in args.percent:
+            font = get_sized_fonts(
+                width=args.width, font_path=args.font, text=text, percent=percent
+            )
+            glyphs.add((text, int(font.size)))
+
+    save_atlas(args.output, args.font, glyphs)
+    print(f"{len(glyphs)} glyphs -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
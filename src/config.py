@@ -1,14 +1,16 @@
+from __future__ import annotations
 from dataclasses import dataclass
 from PIL import ImageFont
 from src.transition import Transition
 from numpy.typing import NDArray
 import numpy as np
-from src.data.noise import NoiseGenerator
-from typing import Iterable, Callable, TypeAlias
+from src.data.noise import NoiseGenerator, derive_seed
+from src.sweep import SweepSpace
+from src.position import Position, PositionSampler
+from src.spec import FontSpec, NoiseSpec, TransitionSpec
+from typing import Any, Iterable, Iterator, Callable
 from itertools import product, repeat, islice
-
-
-Position: TypeAlias = tuple[float, float]
+import threading
 
 
 @dataclass
@@ -18,12 +20,16 @@ class TextInfo:
     position: Position
     initial: NDArray[np.uint8]
     transition: Transition
+    # 전환 중에 새로 뽑는 노이즈의 시드. 없으면 전역 난수를 씁니다.
+    seed: np.random.SeedSequence | None = None
 
 
 @dataclass
 class BackgroundInfo:
     initial: NDArray[np.uint8]
     transition: Transition
+    # 전환 중에 새로 뽑는 노이즈의 시드. 없으면 전역 난수를 씁니다.
+    seed: np.random.SeedSequence | None = None
 
 
 @dataclass
@@ -41,6 +47,127 @@ class DataInfo:
     video_info: VideoInfo
 
 
+class DataTask:
+    """`DataInfo` 하나를 만들기 위한 작은 명세
+
+    배열이나 폰트, 노이즈 생성기, 전환기 객체 대신 `FontSpec`, 시드를 담은 `NoiseSpec`,
+    `TransitionSpec`만 들고 있다가 `build`를 부를 때 비로소 `DataInfo`로 바뀝니다.
+    객체는 받는 프로세스의 캐시에서 꺼내므로 다른 프로세스로 보내는 비용이 작습니다.
+    """
+
+    __slots__ = (
+        "index",
+        "text",
+        "font",
+        "position",
+        "text_transition",
+        "background_transition",
+        "text_noise",
+        "background_noise",
+        "text_fill",
+        "video_info",
+        "seed",
+    )
+
+    def __init__(
+        self,
+        index: int,
+        text: str,
+        font: FontSpec,
+        position: Position,
+        text_transition: TransitionSpec,
+        background_transition: TransitionSpec,
+        text_noise: NoiseSpec,
+        background_noise: NoiseSpec,
+        text_fill: bool,
+        video_info: VideoInfo,
+        seed: np.random.SeedSequence,
+    ):
+        self.index = index
+        self.text = text
+        self.font = font
+        self.position = position
+        self.text_transition = text_transition
+        self.background_transition = background_transition
+        self.text_noise = text_noise
+        self.background_noise = background_noise
+        self.text_fill = text_fill
+        self.video_info = video_info
+        self.seed = seed
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def build(self) -> DataInfo:
+        """시드로부터 노이즈를 만들고 폰트와 전환기를 불러와 `DataInfo`를 만듭니다.
+
+        첫 프레임의 노이즈는 텍스트와 배경 각자의 시드로 뽑으므로 같은 배경끼리 공유하고,
+        렌더링 중에 새로 뽑는 노이즈는 작업마다 다른 `seed`에서 파생한 시드로 뽑습니다.
+        """
+        width = self.video_info.width
+        height = self.video_info.height
+
+        if not self.text_fill:
+            text_initial = self.text_noise.generate(width, height)
+        else:
+            text_initial = np.zeros((height, width), dtype=np.uint8)
+
+        background_initial = self.background_noise.generate(width, height)
+
+        return DataInfo(
+            text_info=TextInfo(
+                text=self.text,
+                font=self.font.load(),
+                position=self.position,
+                initial=text_initial,
+                transition=self.text_transition.resolve(),
+                seed=derive_seed(self.seed, 0),
+            ),
+            background_info=BackgroundInfo(
+                initial=background_initial,
+                transition=self.background_transition.resolve(),
+                seed=derive_seed(self.seed, 1),
+            ),
+            video_info=self.video_info,
+        )
+
+    def __repr__(self):
+        return (
+            f"DataTask(index={self.index}, text={self.text!r}, font={self.font}, "
+            f"position={self.position})"
+        )
+
+
+def task_metadata(index: int, info: DataInfo | DataTask) -> dict[str, Any]:
+    """영상 하나를 설명하는 메타데이터"""
+    if isinstance(info, DataTask):
+        text, position, font_size = info.text, info.position, info.font.size
+        text_transition = info.text_transition.kind
+        background_transition = info.background_transition.kind
+    else:
+        text, position = info.text_info.text, info.text_info.position
+        font_size = getattr(info.text_info.font, "size", None)
+        text_transition = type(info.text_info.transition).__name__
+        background_transition = type(info.background_info.transition).__name__
+
+    return {
+        "index": index,
+        "label": text,
+        "position": tuple(position),
+        "font_size": font_size,
+        "text_transition": text_transition,
+        "background_transition": background_transition,
+    }
+
+
+# `np.random.seed`로 전역 난수를 고정한 뒤 `DataGenerationConfig.build`를 부르는 동안 잡는 잠금.
+# 전역 난수는 프로세스에 하나뿐이므로, 스레드 여럿이 이 경로를 쓰면 서로의 난수를 가져갑니다.
+LEGACY_RNG_LOCK = threading.Lock()
+
 PositionBuilder = Callable[
     [
         str,  # text
@@ -59,7 +186,7 @@ class DataGenerationConfig:
         | ImageFont.FreeTypeFont
         | Iterable[ImageFont.ImageFont | ImageFont.FreeTypeFont]
     )
-    text_position: Position | Callable[..., Position]
+    text_position: Position | PositionSampler | Callable[..., Position]
     n_position_sample: int
     noise_generator: NoiseGenerator
     text_transition: Transition | Iterable[Transition]
@@ -94,7 +221,9 @@ class DataGenerationConfig:
 
         # 포지션 결정
 
-        if callable(self.text_position):
+        if isinstance(self.text_position, PositionSampler):
+            positions = self.text_position.positions(self.n_position_sample)
+        elif callable(self.text_position):
             positions = islice(
                 iter(self.text_position, object()), self.n_position_sample
             )
@@ -163,3 +292,93 @@ class DataGenerationConfig:
                 product(text_info, background_info, video_info),
             )
         )
+
+    def build_seeded(self, seed: int) -> list[DataInfo]:
+        """전역 난수를 `np.random.seed(seed)`로 고정하고 `build`를 부릅니다.
+
+        위치와 노이즈를 전역 난수에서 뽑으므로 `LEGACY_RNG_LOCK`을 잡고 만들며,
+        같은 `seed`는 어느 스레드에서 불러도 같은 결과를 만듭니다.
+        """
+        with LEGACY_RNG_LOCK:
+            np.random.seed(seed)
+            return self.build()
+
+    def stream(self, seed: int = 0) -> Iterator[DataTask]:
+        """`build`와 같은 순서로 `DataTask`를 하나씩 만들어 냅니다.
+
+        노이즈 배열을 미리 만들지 않고 명세마다 시드만 정해 두므로,
+        `n_position_sample`이나 조합 수가 늘어도 메모리 사용량이 일정합니다.
+
+        Args:
+            seed (int): 명세마다 나눠 줄 시드의 기준값
+        """
+        texts = [self.text] if isinstance(self.text, str) else list(self.text)
+
+        if isinstance(self.font, (ImageFont.ImageFont, ImageFont.FreeTypeFont)):
+            fonts = [FontSpec.from_font(self.font)]
+        else:
+            fonts = [FontSpec.from_font(font) for font in self.font]
+
+        if isinstance(self.text_position, PositionSampler):
+            # 전역 난수 대신 시드에서 만든 생성기로 한꺼번에 뽑습니다.
+            position_rng = np.random.default_rng(derive_seed(seed, 2))
+            positions = self.text_position.positions(
+                self.n_position_sample, rng=position_rng
+            )
+        elif callable(self.text_position):
+            positions = list(
+                islice(iter(self.text_position, object()), self.n_position_sample)
+            )
+        else:
+            positions = [self.text_position] * self.n_position_sample
+
+        if isinstance(self.text_transition, Transition):
+            text_transitions = [self.text_transition]
+        else:
+            text_transitions = list(self.text_transition)
+
+        if isinstance(self.background_transition, Transition):
+            background_transitions = [self.background_transition]
+        else:
+            background_transitions = list(self.background_transition)
+
+        video_info = VideoInfo(
+            width=self.width,
+            height=self.height,
+            fps=self.fps,
+            length=self.length,
+        )
+
+        space = SweepSpace(
+            text=texts,
+            text_transition=[
+                TransitionSpec.from_transition(t) for t in text_transitions
+            ],
+            position=positions,
+            font=fonts,
+            background_transition=[
+                TransitionSpec.from_transition(t) for t in background_transitions
+            ],
+        )
+        noise = NoiseSpec.from_noise(self.noise_generator)
+        # build()와 마찬가지로 첫 프레임의 배경 노이즈는 같은 배경 전환기끼리 공유하고,
+        # 전환 중에 새로 뽑는 노이즈는 작업마다 따로 뽑습니다.
+        n_backgrounds = len(background_transitions)
+        for index, task in space.items():
+            yield DataTask(
+                index=index,
+                text=task.text,
+                font=task.font,
+                position=task.position,
+                text_transition=task.text_transition,
+                background_transition=task.background_transition,
+                text_noise=noise.with_seed(
+                    derive_seed(seed, 0, index // n_backgrounds)
+                ),
+                background_noise=noise.with_seed(
+                    derive_seed(seed, 1, index % n_backgrounds)
+                ),
+                text_fill=self.text_fill,
+                video_info=video_info,
+                seed=derive_seed(seed, 3, index),
+            )
@@ -1,13 +1,15 @@
 from src.utils import load_default_data_settings
 from src.data.generator import DataGenerator
+from src.data.pipeline import PipelineStats
 
 
 def main():
-    info = load_default_data_settings().build()
+    info = load_default_data_settings().stream()
     data_generator = DataGenerator(info)
 
-    for video in data_generator:
-        video.save("./data/test-task")
+    stats = PipelineStats()
+    data_generator.save("./data/test-task", writers=2, stats=stats)
+    print(stats)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+"""0과 255로만 이루어진 영상을 비트 단위로 저장하는 형식
+
+베르누이 노이즈 영상은 모든 픽셀이 0 또는 255이므로 픽셀마다 1비트면 충분합니다.
+프레임마다 `np.packbits`로 묶은 비트 평면을 `src.data.container` 형식으로 저장하며,
+헤더에는 영상 모양, fps, 메타데이터 한 줄이 들어갑니다. 손실 없이 그대로 복원됩니다.
+"""
+
+from __future__ import annotations
+from dataclasses import asdict, is_dataclass
+from typing import Any, Sequence
+from numpy.typing import NDArray
+import numpy as np
+from src.data.container import read_header, write_container
+
+MAGIC = b"DDBITS01"
+
+
+def is_binary(frames: NDArray[np.uint8]) -> bool:
+    """모든 값이 0 또는 255인지 확인합니다."""
+    return not np.any((frames != 0) & (frames != 255))
+
+
+def save_bits(
+    path: str,
+    frames: NDArray[np.uint8],
+    fps: float,
+    metadata: Any = None,
+):
+    """0과 255로만 이루어진 `(T, H, W[, C])` 영상을 비트 평면으로 저장합니다.
+
+    Args:
+        path (str): 저장할 경로
+        frames (NDArray[np.uint8]): 저장할 영상
+        fps (float): 초당 프레임 수
+        metadata (Any): 헤더에 함께 넣을 메타데이터. 데이터클래스나 딕셔너리를 쓸 수 있습니다.
+    """
+    if not is_binary(frames):
+        raise ValueError("bit-packed videos can only hold 0 and 255")
+
+    if is_dataclass(metadata):
+        metadata = asdict(metadata)
+
+    # 프레임마다 바이트 경계에 맞춰 묶어 두면 한 프레임씩 바로 풀 수 있습니다.
+    packed = np.packbits(frames.reshape(len(frames), -1) != 0, axis=1)
+    header = {
+        "shape": list(frames.shape),
+        "fps": fps,
+        "frame_bytes": packed.shape[1],
+        "metadata": metadata,
+    }
+    write_container(path, MAGIC, header, [packed])
+
+
+class BitVideo:
+    def __init__(self, path: str):
+        """`save_bits`로 저장한 영상을 메모리 맵으로 엽니다.
+
+        프레임은 읽을 때마다 풀기 때문에 파일 전체를 메모리에 올리지 않습니다.
+
+        Args:
+            path (str): 파일 경로
+        """
+        header, offset = read_header(path, MAGIC)
+
+        self.path = path
+        self.shape: tuple[int, ...] = tuple(header["shape"])
+        self.fps: float = header["fps"]
+        self.metadata: dict[str, Any] | None = header["metadata"]
+        self.packed = np.memmap(
+            path,
+            dtype=np.uint8,
+            mode="r",
+            offset=offset,
+            shape=(self.shape[0], header["frame_bytes"]),
+        )
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def frames(self, frames: Sequence[int] | slice | None = None) -> NDArray[np.uint8]:
+        """`frames`번째 프레임들을 0과 255의 uint8 배열로 풉니다."""
+        packed = self.packed if frames is None else self.packed[frames]
+        n_pixels = int(np.prod(self.shape[1:]))
+        bits = np.unpackbits(packed, axis=-1, count=n_pixels)
+        bits *= 255
+        return bits.reshape(*packed.shape[:-1], *self.shape[1:])
+
+    def __getitem__(self, t: int) -> NDArray[np.uint8]:
+        return self.frames(t)
+
+    def __array__(self, dtype=None, copy=None) -> NDArray[np.uint8]:
+        frames = self.frames()
+        return frames if dtype is None else frames.astype(dtype)
+
+    def tensor(self, frames: Sequence[int] | slice | None = None, dtype=None):
+        """`frames`번째 프레임들을 `torch.Tensor`로 반환합니다.
+
+        `torch`는 이 메서드를 부를 때 불러옵니다. `dtype`이 실수형이면 0과 1로 바꿉니다.
+        """
+        import torch
+
+        tensor = torch.from_numpy(self.frames(frames))
+        if dtype is None or dtype == torch.uint8:
+            return tensor
+        if dtype.is_floating_point:
+            return tensor.to(dtype).div_(255)
+        return tensor.to(dtype)
+
+    def __repr__(self):
+        return f"BitVideo({self.path!r}, shape={self.shape}, fps={self.fps})"
+
+
+def load_bits(path: str) -> NDArray[np.uint8]:
+    """`save_bits`로 저장한 영상 전체를 uint8 배열로 읽습니다."""
+    return BitVideo(path).frames()
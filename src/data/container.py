@@ -0,0 +1,47 @@
+"""매직 + JSON 헤더 + 정렬된 바이너리 데이터로 이루어진 파일 형식
+
+파일 구성:
+    - 8바이트 매직
+    - 8바이트 little-endian 헤더 길이
+    - JSON 헤더
+    - `ALIGN`바이트로 정렬된 데이터
+"""
+
+from typing import Any, Iterable
+from numpy.typing import NDArray
+import numpy as np
+import json
+import struct
+
+ALIGN = 64
+
+
+def align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_container(
+    path: str, magic: bytes, header: dict[str, Any], chunks: Iterable[NDArray]
+):
+    """`header`와 `chunks`의 바이트를 이어서 `path`에 씁니다."""
+    if len(magic) != 8:
+        raise ValueError(f"magic must be 8 bytes, got {magic!r}")
+
+    encoded = json.dumps(header, ensure_ascii=False, default=str).encode()
+    with open(path, "wb") as f:
+        f.write(magic)
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        f.write(b"\0" * (align(16 + len(encoded)) - 16 - len(encoded)))
+        for chunk in chunks:
+            f.write(np.ascontiguousarray(chunk).tobytes())
+
+
+def read_header(path: str, magic: bytes) -> tuple[dict[str, Any], int]:
+    """`path`의 헤더와 데이터가 시작하는 바이트 위치를 반환합니다."""
+    with open(path, "rb") as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError(f"{path} is not a {magic.rstrip(bytes(1)).decode()} file")
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    return header, align(16 + header_size)
@@ -0,0 +1,100 @@
+"""`torch.utils.data`로 영상을 바로 읽는 데이터셋
+
+- `GeneratorDataset`: 생성기를 감싸 영상을 그 자리에서 만들어 내는 `IterableDataset`.
+  `DataLoader`의 워커마다 작업을 띄엄띄엄 나눠 가집니다.
+- `VideoDataset`: 샤드(`ShardReader`), 비트 패킹 파일(`.bits`), `VirtualDataset`을
+  번호로 읽는 `Dataset`. 워커 분배는 `DataLoader`가 합니다.
+
+두 데이터셋 모두 `(uint8 텐서, 메타데이터 딕셔너리)`를 반환하므로 인코딩과 디코딩을 거치지 않습니다.
+"""
+
+from __future__ import annotations
+from typing import Any, Iterable, Iterator, Sequence
+from itertools import islice
+from numpy.typing import NDArray
+import numpy as np
+import torch
+from torch.utils.data import Dataset, IterableDataset, get_worker_info
+from src.config import DataGenerationConfig, DataInfo, DataTask, task_metadata
+from src.data.bitvideo import BitVideo
+from src.data.generator import DataGenerator
+from src.data.shard import ShardReader
+from src.data.virtual import VirtualDataset
+
+
+def _to_tensor(video: NDArray[np.uint8]) -> torch.Tensor:
+    # 메모리 맵 같은 읽기 전용 배열은 torch가 그대로 감쌀 수 없으므로 복사합니다.
+    if not video.flags.writeable or not video.flags.c_contiguous:
+        video = np.array(video)
+    return torch.from_numpy(video)
+
+
+class GeneratorDataset(IterableDataset):
+    def __init__(
+        self,
+        source: DataGenerationConfig | Iterable[DataInfo | DataTask],
+        seed: int = 0,
+    ):
+        """영상을 생성하면서 바로 내보내는 데이터셋
+
+        `source`가 `DataGenerationConfig`면 워커마다 `stream(seed)`를 다시 만들어
+        같은 작업 목록을 얻고, 그중 자기 몫만 렌더링합니다.
+        그 밖의 반복 가능 객체는 워커마다 처음부터 따라가며 자기 몫만 고릅니다.
+
+        Args:
+            source (DataGenerationConfig | Iterable[DataInfo | DataTask]): 만들 영상들
+            seed (int): `stream`에 넘길 시드
+        """
+        self.source = source
+        self.seed = seed
+
+    def _tasks(self) -> Iterable[DataInfo | DataTask]:
+        if isinstance(self.source, DataGenerationConfig):
+            return self.source.stream(self.seed)
+        return self.source
+
+    def __iter__(self) -> Iterator[tuple[torch.Tensor, dict[str, Any]]]:
+        worker = get_worker_info()
+        tasks = enumerate(self._tasks())
+        if worker is not None:
+            tasks = islice(tasks, worker.id, None, worker.num_workers)
+
+        for index, info in tasks:
+            metadata = task_metadata(index, info)
+            if isinstance(info, DataTask):
+                info = info.build()
+            yield torch.from_numpy(DataGenerator.render(info)), metadata
+
+
+class VideoDataset(Dataset):
+    def __init__(self, source: str | ShardReader | VirtualDataset | Sequence[str]):
+        """저장했거나 다시 만들 수 있는 영상들을 번호로 읽는 데이터셋
+
+        Args:
+            source: 샤드 디렉토리 경로나 `ShardReader`, `.bits` 파일 경로 목록,
+                또는 `VirtualDataset`
+        """
+        if isinstance(source, str):
+            source = ShardReader(source)
+        self.source = source
+
+        if isinstance(source, ShardReader):
+            self.keys: list[Any] = list(source)
+        else:
+            self.keys = list(range(len(source)))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, i: int) -> tuple[torch.Tensor, dict[str, Any]]:
+        key = self.keys[i]
+        if isinstance(self.source, ShardReader):
+            video = self.source[key]
+            metadata = self.source.metadata(key) or {}
+        elif isinstance(self.source, VirtualDataset):
+            video, metadata = self.source[key]
+        else:
+            bits = BitVideo(self.source[key])
+            video = bits.frames()
+            metadata = bits.metadata or {}
+        return _to_tensor(video), {"index": key, **metadata}
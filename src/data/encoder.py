@@ -0,0 +1,140 @@
+from abc import ABC, abstractmethod
+from typing import Any
+from numpy.typing import NDArray
+import numpy as np
+import cv2
+from src.data.bitvideo import save_bits
+
+
+def _to_bgr(frames: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    if frames.ndim == 4:
+        return frames
+    # 프레임마다 변환하지 않고 영상 전체를 한 번에 변환합니다.
+    bgr = cv2.cvtColor(frames.reshape(-1, frames.shape[2]), cv2.COLOR_GRAY2BGR)
+    return bgr.reshape(*frames.shape, 3)
+
+
+def _to_gray(frames: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    if frames.ndim == 3:
+        return frames
+    gray = cv2.cvtColor(frames.reshape(-1, *frames.shape[2:]), cv2.COLOR_BGR2GRAY)
+    return gray.reshape(frames.shape[:3])
+
+
+class VideoEncoder(ABC):
+    extension: str
+
+    @abstractmethod
+    def write(
+        self,
+        path: str,
+        frames: NDArray[np.uint8],
+        fps: float,
+        metadata: Any = None,
+    ):
+        """`(T, H, W)` 또는 `(T, H, W, C)` 영상 전체를 `path`에 저장합니다.
+
+        `metadata`는 파일에 메타데이터를 담을 수 있는 인코더만 사용합니다.
+        """
+
+
+class OpenCVEncoder(VideoEncoder):
+    def __init__(self, fourcc: str, is_color: bool = True, extension: str = "avi"):
+        """`cv2.VideoWriter`로 저장하는 인코더
+
+        Args:
+            fourcc (str): 코덱 fourcc
+            is_color (bool): `True`면 BGR 3채널로, `False`면 회색조 1채널로 저장합니다.
+            extension (str): 파일 확장자
+        """
+        self.fourcc = fourcc
+        self.is_color = is_color
+        self.extension = extension
+
+    def write(
+        self,
+        path: str,
+        frames: NDArray[np.uint8],
+        fps: float,
+        metadata: Any = None,
+    ):
+        frames = _to_bgr(frames) if self.is_color else _to_gray(frames)
+        height, width = frames.shape[1:3]
+
+        writer = cv2.VideoWriter(
+            filename=path,
+            fourcc=cv2.VideoWriter.fourcc(*self.fourcc),
+            fps=fps,
+            frameSize=(width, height),
+            isColor=self.is_color,
+        )
+        if not writer.isOpened():
+            raise RuntimeError(f"cannot open video writer for {path} ({self.fourcc})")
+        for frame in frames:
+            writer.write(frame)
+        writer.release()
+
+    def __repr__(self):
+        return f"OpenCVEncoder({self.fourcc!r}, is_color={self.is_color})"
+
+
+class NpyEncoder(VideoEncoder):
+    extension = "npy"
+
+    def write(
+        self,
+        path: str,
+        frames: NDArray[np.uint8],
+        fps: float,
+        metadata: Any = None,
+    ):
+        """배열을 그대로 `np.save`로 저장합니다. `fps`는 저장하지 않습니다."""
+        np.save(path, frames)
+
+    def __repr__(self):
+        return "NpyEncoder()"
+
+
+class BitPackEncoder(VideoEncoder):
+    extension = "bits"
+
+    def write(
+        self,
+        path: str,
+        frames: NDArray[np.uint8],
+        fps: float,
+        metadata: Any = None,
+    ):
+        """0과 255로만 이루어진 영상을 `src.data.bitvideo` 형식으로 저장합니다."""
+        save_bits(path, frames, fps, metadata=metadata)
+
+    def __repr__(self):
+        return "BitPackEncoder()"
+
+
+ENCODERS: dict[str, VideoEncoder] = {}
+
+
+def register_encoder(name: str, encoder: VideoEncoder):
+    """`VideoData.save(encoder=name)`으로 쓸 수 있도록 인코더를 등록합니다."""
+    ENCODERS[name] = encoder
+
+
+def get_encoder(encoder: str | VideoEncoder) -> VideoEncoder:
+    if isinstance(encoder, VideoEncoder):
+        return encoder
+    if encoder not in ENCODERS:
+        raise KeyError(f"unknown encoder {encoder!r}; choose from {sorted(ENCODERS)}")
+    return ENCODERS[encoder]
+
+
+# 기존과 같은 손실 압축 컬러 AVI
+register_encoder("mp4v", OpenCVEncoder("mp4v", is_color=True))
+# 무손실 컬러 AVI
+register_encoder("ffv1", OpenCVEncoder("FFV1", is_color=True))
+# 무손실 회색조 AVI. 베르누이 노이즈처럼 채널이 하나인 영상에 맞습니다.
+register_encoder("gray", OpenCVEncoder("FFV1", is_color=False))
+# 압축하지 않은 배열
+register_encoder("npy", NpyEncoder())
+# 0과 255로만 이루어진 영상의 비트 평면
+register_encoder("bits", BitPackEncoder())
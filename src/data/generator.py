@@ -1,7 +1,9 @@
-from src.config import DataInfo
+from src.config import DataInfo, DataTask
 from dataclasses import dataclass
-from src.utils import get_text_mask
-from typing import Generator
+from src.utils import get_text_roi
+from src.data.encoder import VideoEncoder, get_encoder
+from src.data.pipeline import PipelineStats, save_pipelined
+from typing import Any, Generator, Iterable
 from numpy.typing import NDArray
 import numpy as np
 import cv2
@@ -12,59 +14,130 @@ from pathlib import Path
 @dataclass
 class VideoData:
     index: int
-    data: list[NDArray[np.uint8]]
+    data: NDArray[np.uint8]  # (T, H, W) 또는 (T, H, W, C)
     info: DataInfo
 
-    def save(self, directory: str):
-        path = osp.join(directory, f"{self.index}.avi")
+    def save(
+        self,
+        directory: str,
+        encoder: str | VideoEncoder = "mp4v",
+        metadata: Any = None,
+    ) -> str:
+        """영상을 `directory/{index}.{확장자}`에 저장하고 그 경로를 반환합니다.
+
+        Args:
+            directory (str): 저장할 디렉토리
+            encoder (str | VideoEncoder): 인코더 또는 `ENCODERS`에 등록된 이름.
+                `"mp4v"`(기본), `"ffv1"`, `"gray"`, `"npy"`, `"bits"`를 쓸 수 있습니다.
+            metadata (Any): 파일에 함께 담을 메타데이터. `"bits"`만 사용합니다.
+        """
+        encoder = get_encoder(encoder)
+        path = osp.join(directory, f"{self.index}.{encoder.extension}")
         Path(path).parent.mkdir(parents=True, exist_ok=True)
 
-        fourcc = cv2.VideoWriter.fourcc(*"mp4v")
-        writer = cv2.VideoWriter(
-            filename=path,
-            fourcc=fourcc,
-            fps=self.info.video_info.fps,
-            frameSize=(self.info.video_info.width, self.info.video_info.height),
-            isColor=True,
-        )
-        for frame in self.data:
-            if frame.ndim == 3 and frame.shape[2] == 3:
-                writer.write(frame)
-            else:
-                writer.write(cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
-        writer.release()
+        encoder.write(path, self.data, fps=self.info.video_info.fps, metadata=metadata)
+        return path
 
 
 class DataGenerator:
-    def __init__(self, info: list[DataInfo]):
+    def __init__(self, info: Iterable[DataInfo | DataTask]):
+        """`info`로 영상을 만드는 생성기
+
+        `DataTask`는 렌더링 직전에 `DataInfo`로 바꾸므로,
+        `DataGenerationConfig.stream()`을 그대로 넘겨도 됩니다.
+        """
         self.info = info
 
     def __iter__(self) -> Generator[VideoData, None, None]:
         for index, info in enumerate(self.info):
-            mask = get_text_mask(
-                position=info.text_info.position,
-                width=info.video_info.width,
-                height=info.video_info.height,
-                font=info.text_info.font,
-                text=info.text_info.text,
-            )
-            frames: list[NDArray[np.uint8]] = []
-
-            text_generator = info.text_info.transition.iter(info.text_info.initial)
-            background_generator = info.background_info.transition.iter(
-                info.background_info.initial
-            )
-
-            for text, background in zip(text_generator, background_generator):
-                frame = background.copy()
-                if frame.ndim == 3:
-                    if text.ndim == 2:
-                        text = cv2.cvtColor(text, cv2.COLOR_GRAY2BGR)
-                else:
-                    if text.ndim == 3:
-                        text = cv2.cvtColor(text, cv2.COLOR_BGR2GRAY)
-                frame[mask] = text[mask]
-
-                frames.append(frame)
-
-            yield VideoData(index=index, data=frames, info=info)
+            if isinstance(info, DataTask):
+                info = info.build()
+            yield VideoData(index=index, data=self.render(info), info=info)
+
+    def save(
+        self,
+        directory: str,
+        encoder: str | VideoEncoder = "mp4v",
+        writers: int = 1,
+        queue_size: int | None = None,
+        stats: PipelineStats | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> list[str]:
+        """모든 영상을 `directory`에 저장하고 경로들을 반환합니다.
+
+        합성은 부르는 스레드에서, 인코딩과 쓰기는 작성 스레드 `writers`개에서 겹쳐 돌립니다.
+        자세한 것은 `src.data.pipeline.save_pipelined`를 보세요.
+        """
+        return save_pipelined(
+            self,
+            directory,
+            encoder=encoder,
+            writers=writers,
+            queue_size=queue_size,
+            stats=stats,
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def shape(info: DataInfo) -> tuple[int, ...]:
+        """`render`가 만들 배열의 모양"""
+        n_frames = min(
+            len(info.text_info.transition), len(info.background_info.transition)
+        )
+        return (n_frames, *info.background_info.initial.shape)
+
+    @staticmethod
+    def render(
+        info: DataInfo, out: NDArray[np.uint8] | None = None
+    ) -> NDArray[np.uint8]:
+        """`info`로 정해지는 영상 전체를 `(T, H, W[, C])` 배열 하나로 합성합니다.
+
+        배경은 전환기의 `render`로 모든 프레임을 버퍼에 바로 그리고, 텍스트는 글자가
+        있는 사각형(ROI)만 그립니다. 채널 변환과 마스크 합성도 이 사각형 안에서만 합니다.
+
+        Args:
+            info (DataInfo): 만들 영상의 정보
+            out (NDArray[np.uint8] | None): 결과를 쓸 버퍼. 없으면 새로 할당합니다.
+        """
+        roi = get_text_roi(
+            position=info.text_info.position,
+            width=info.video_info.width,
+            height=info.video_info.height,
+            font=info.text_info.font,
+            text=info.text_info.text,
+        )
+        text_transition = info.text_info.transition
+        background_transition = info.background_info.transition
+        n_frames = min(len(text_transition), len(background_transition))
+
+        text_initial = info.text_info.initial
+        background_initial = info.background_info.initial
+
+        frames = range(n_frames)
+        text = text_transition.render(
+            text_initial,
+            frames,
+            seed=info.text_info.seed,
+            region=(roi.rows, roi.cols),
+        )
+        out = background_transition.render(
+            background_initial, frames, out=out, seed=info.background_info.seed
+        )
+
+        mask = roi.mask
+        if not mask.size:
+            return out
+
+        target = out[:, roi.rows, roi.cols]
+        if target.ndim == 4:
+            if text.ndim == 3:
+                # GRAY2BGR은 채널 복제이므로 브로드캐스트로 대신합니다.
+                text = text[..., np.newaxis]
+            mask = mask[..., np.newaxis]
+        elif text.ndim == 4:
+            text = cv2.cvtColor(
+                text.reshape(-1, *text.shape[2:]), cv2.COLOR_BGR2GRAY
+            ).reshape(text.shape[:3])
+
+        np.copyto(target, text, where=mask)
+        return out
@@ -1,12 +1,169 @@
 from numpy.typing import NDArray
 import numpy as np
 from abc import ABC, abstractmethod
+from typing import Sequence
+
+# 한 번에 뽑을 난수 개수. 임시 버퍼가 이보다 커지지 않도록 나눠서 뽑습니다.
+_CHUNK = 1 << 20
+
+
+def derive_seed(
+    seed: int | np.random.SeedSequence, *key: int
+) -> np.random.SeedSequence:
+    """`seed`에서 `key`번째 자식 시드를 O(1)에 만듭니다.
+
+    `seed.spawn`이 `key`번째로 만드는 자식과 같으며, 엔트로피를 자르지 않습니다.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return np.random.SeedSequence(
+        seed.entropy,
+        spawn_key=(*seed.spawn_key, *key),
+        pool_size=seed.pool_size,
+    )
+
+
+def _chunks(out: NDArray[np.uint8]):
+    """`out`을 평탄화해 `_CHUNK`개씩 잘린 뷰로 나눕니다."""
+    flat = out.reshape(-1)
+    for start in range(0, flat.size, _CHUNK):
+        yield flat[start : start + _CHUNK]
 
 
 class NoiseGenerator(ABC):
     @abstractmethod
-    def __call__(self, width: int, height: int) -> NDArray[np.uint8]:
-        """`(width, height)` 사이즈의 노이즈를 생성합니다."""
+    def __call__(
+        self, width: int, height: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.uint8]:
+        """`(width, height)` 사이즈의 노이즈를 생성합니다.
+
+        `rng`가 없으면 전역 난수(`np.random`)를 써서, `np.random.seed`로 고정한
+        기존 결과를 그대로 재현합니다.
+        """
+
+    @abstractmethod
+    def shape(self, width: int, height: int) -> tuple[int, ...]:
+        """`(width, height)` 사이즈 노이즈 한 장의 배열 모양"""
+
+    # 기본 난수장의 dtype. `None`이면 난수장을 미리 잡은 버퍼에 뽑을 수 없습니다.
+    field_dtype: type | None = None
+
+    @abstractmethod
+    def draw_field(
+        self, size: int, rng: np.random.Generator, out: NDArray | None = None
+    ) -> NDArray:
+        """노이즈 세기와 무관한 기본 난수장 `size`개를 뽑습니다.
+
+        `out`을 주면 새로 할당하지 않고 그 버퍼에 뽑아 반환합니다.
+        """
+
+    @abstractmethod
+    def from_field(
+        self, field: NDArray, out: NDArray[np.uint8], scratch: NDArray | None = None
+    ) -> NDArray[np.uint8]:
+        """기본 난수장 `field`를 이 노이즈로 바꿔 평탄한 `out`에 씁니다.
+
+        `scratch`는 변환에 쓸 `field`와 같은 크기의 임시 버퍼입니다.
+        `field` 자신을 넘기면 `field`를 덮어쓰며 변환합니다.
+        """
+
+    def _field_buffer(self, size: int) -> NDArray | None:
+        if self.field_dtype is None:
+            return None
+        return np.empty(min(size, _CHUNK), dtype=self.field_dtype)
+
+    def fill(
+        self, out: NDArray[np.uint8], rng: np.random.Generator
+    ) -> NDArray[np.uint8]:
+        """`out` 전체를 `rng`에서 뽑은 노이즈로 채웁니다.
+
+        `out`의 모양은 자유롭지만 C 연속이어야 합니다.
+        난수장은 버퍼 하나에 뽑아 그 자리에서 변환합니다.
+        """
+        buffer = self._field_buffer(out.size)
+        for chunk in _chunks(out):
+            scratch = None if buffer is None else buffer[: chunk.size]
+            field = self.draw_field(chunk.size, rng, out=scratch)
+            self.from_field(field, chunk, scratch=field)
+        return out
+
+    @staticmethod
+    def ladder(
+        levels: Sequence["NoiseGenerator"],
+        width: int,
+        height: int,
+        rng: np.random.Generator,
+        frames: int | None = None,
+    ) -> NDArray[np.uint8]:
+        """같은 종류의 노이즈 여러 세기를 난수장 하나에서 한꺼번에 만듭니다.
+
+        난수는 한 번만 뽑고, 세기마다 임계값(베르누이) 또는 아핀 변환(가우시안)만
+        다르게 적용합니다. 따라서 세기끼리 서로 짝지어진(coupled) 노이즈가 되며,
+        각 세기는 같은 `rng`로 `fill`한 결과와 똑같습니다.
+
+        `run_sweep`의 작업은 작업 번호를 시드로 쓰므로 세기가 다른 작업끼리 난수장을
+        나눌 수 없습니다. 세기끼리 짝지은 노이즈가 필요할 때 직접 부르는 도구입니다.
+
+        Args:
+            levels (Sequence[NoiseGenerator]): 같은 클래스의 노이즈 생성기들
+            width (int): 노이즈 너비
+            height (int): 노이즈 높이
+            rng (np.random.Generator): 난수 생성기
+            frames (int | None): 세기마다 만들 프레임 수. 없으면 한 장만 만듭니다.
+
+        Returns:
+            `(len(levels), [frames,] *shape)` 모양의 배열
+        """
+        if not levels:
+            raise ValueError("levels must not be empty")
+        base = levels[0]
+        if any(type(level) is not type(base) for level in levels):
+            raise TypeError("all levels of a ladder must be the same noise type")
+
+        shape = base.shape(width, height)
+        if frames is not None:
+            shape = (frames, *shape)
+        out = np.empty((len(levels), *shape), dtype=np.uint8)
+
+        # 난수장과 변환용 버퍼를 하나씩만 잡아 모든 조각과 세기에 다시 씁니다.
+        flats = [level_out.reshape(-1) for level_out in out]
+        buffer = base._field_buffer(flats[0].size)
+        scratch = base._field_buffer(flats[0].size)
+        for start in range(0, flats[0].size, _CHUNK):
+            stop = min(start + _CHUNK, flats[0].size)
+            size = stop - start
+            field = base.draw_field(
+                size, rng, out=None if buffer is None else buffer[:size]
+            )
+            for level, flat in zip(levels, flats):
+                level.from_field(
+                    field,
+                    flat[start:stop],
+                    scratch=None if scratch is None else scratch[:size],
+                )
+        return out
+
+    def sample(
+        self,
+        frames: int,
+        width: int,
+        height: int,
+        rng: np.random.Generator | None = None,
+        out: NDArray[np.uint8] | None = None,
+    ) -> NDArray[np.uint8]:
+        """노이즈 `frames`장을 `(frames, *shape)` 배열 하나로 생성합니다."""
+        if out is None:
+            out = np.empty((frames, *self.shape(width, height)), dtype=np.uint8)
+
+        if rng is None:
+            for t in range(frames):
+                out[t] = self(width=width, height=height)
+            return out
+
+        if not out.flags.c_contiguous:
+            out[...] = self.fill(np.empty(out.shape, dtype=np.uint8), rng)
+            return out
+        return self.fill(out, rng)
 
 
 class BernoulliNoise(NoiseGenerator):
@@ -18,14 +175,60 @@ class BernoulliNoise(NoiseGenerator):
         Args:
             p (float): 픽셀을 검은색(0)으로 칠할 확률
         """
+        if not 0 <= p <= 1:
+            raise ValueError(f"p must be in [0, 1], got {p}")
         self.p = p
 
-    def __call__(self, width: int, height: int) -> NDArray[np.uint8]:
-        return np.random.choice(
-            [0, 255],
-            size=(height, width),
-            p=[self.p, 1 - self.p],
-        ).astype(np.uint8)
+    def shape(self, width: int, height: int) -> tuple[int, ...]:
+        return (height, width)
+
+    def __call__(
+        self, width: int, height: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.uint8]:
+        if rng is not None:
+            return self.fill(np.empty(self.shape(width, height), np.uint8), rng)
+
+        # np.random.choice([0, 255], p=[p, 1 - p])와 같은 난수를 같은 순서로 소비합니다.
+        # choice는 정규화한 누적확률에 균등난수를 searchsorted 하므로,
+        # 첫 누적확률과 한 번 비교하는 것으로 충분합니다.
+        cdf = np.cumsum(np.array([self.p, 1 - self.p], dtype=np.float64))
+        cdf /= cdf[-1]
+        uniform = np.random.random_sample((height, width))
+
+        out = np.empty((height, width), dtype=np.uint8)
+        np.greater_equal(uniform, cdf[0], out=out)
+        out *= 255
+        return out
+
+    def draw_field(
+        self,
+        size: int,
+        rng: np.random.Generator,
+        out: NDArray[np.uint32] | None = None,
+    ) -> NDArray[np.uint32]:
+        # `Generator.integers`는 `out`을 받지 않으므로 조각마다 새로 뽑습니다.
+        field = rng.integers(0, 2**32, size=size, dtype=np.uint32)
+        if out is None:
+            return field
+        out[...] = field
+        return out
+
+    def from_field(
+        self,
+        field: NDArray[np.uint32],
+        out: NDArray[np.uint8],
+        scratch: NDArray[np.uint32] | None = None,
+    ) -> NDArray[np.uint8]:
+        # 비교 결과를 `out`에 바로 쓰므로 임시 버퍼가 필요 없습니다.
+        # 32비트 균등 정수를 임계값과 비교합니다. 임계값 아래면 검은색(0)입니다.
+        threshold = round(self.p * 2**32)
+        if threshold >= 2**32:
+            out.fill(0)
+            return out
+
+        np.greater_equal(field, np.uint32(threshold), out=out)
+        out *= 255
+        return out
 
     def __repr__(self):
         return f"BernolliNoise({self.p})"
@@ -44,10 +247,45 @@ class GaussianNoise(NoiseGenerator):
         self.mean = mean
         self.std = std
 
-    def __call__(self, width: int, height: int) -> NDArray[np.uint8]:
+    def shape(self, width: int, height: int) -> tuple[int, ...]:
+        return (height, width, 3)
+
+    def __call__(
+        self, width: int, height: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.uint8]:
+        if rng is not None:
+            return self.fill(np.empty(self.shape(width, height), np.uint8), rng)
+
         noise = np.random.normal(self.mean, self.std, size=(height, width, 3))
         noise = np.clip(noise, 0, 255)
         return noise.astype(np.uint8)
 
+    field_dtype = np.float32
+
+    def draw_field(
+        self,
+        size: int,
+        rng: np.random.Generator,
+        out: NDArray[np.float32] | None = None,
+    ) -> NDArray[np.float32]:
+        # float64 배열 대신 float32로 뽑습니다.
+        if out is None:
+            return rng.standard_normal(size, dtype=np.float32)
+        return rng.standard_normal(dtype=np.float32, out=out)
+
+    def from_field(
+        self,
+        field: NDArray[np.float32],
+        out: NDArray[np.uint8],
+        scratch: NDArray[np.float32] | None = None,
+    ) -> NDArray[np.uint8]:
+        if scratch is None:
+            scratch = np.empty_like(field)
+        np.multiply(field, np.float32(self.std), out=scratch)
+        scratch += np.float32(self.mean)
+        np.clip(scratch, 0, 255, out=scratch)
+        np.copyto(out, scratch, casting="unsafe")
+        return out
+
     def __repr__(self):
         return f"GaussianNoise({self.mean}, {self.std})"
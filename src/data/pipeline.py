@@ -0,0 +1,162 @@
+"""합성과 인코딩을 겹쳐 돌리는 생성 파이프라인
+
+부르는 스레드는 영상을 합성해 크기가 정해진 큐에 넣고, 작성 스레드들이 큐에서 꺼내
+인코딩하고 파일로 씁니다. cv2와 NumPy는 작업하는 동안 GIL을 놓으므로 한 프로세스
+안에서도 합성과 인코딩이 실제로 겹칩니다. 큐가 가득 차면 합성이 기다리므로
+메모리에는 많아야 `queue_size + writers`개의 영상만 남습니다.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+import queue
+import threading
+import time
+from src.data.encoder import VideoEncoder, get_encoder
+
+
+@dataclass
+class StageStats:
+    """파이프라인 한 단계의 처리량
+
+    `busy`는 실제로 일한 시간, `blocked`는 다른 단계를 기다린 시간(초)입니다.
+    여러 스레드가 나눠 맡은 단계는 스레드들의 시간을 더합니다.
+    """
+
+    name: str
+    items: int = 0
+    bytes: int = 0
+    busy: float = 0.0
+    blocked: float = 0.0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add(
+        self, items: int = 0, bytes: int = 0, busy: float = 0.0, blocked: float = 0.0
+    ):
+        with self._lock:
+            self.items += items
+            self.bytes += bytes
+            self.busy += busy
+            self.blocked += blocked
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.busy if self.busy else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / self.busy / 1e6 if self.busy else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.name}: {self.items} videos, "
+            f"{self.items_per_second:.2f} videos/s, {self.megabytes_per_second:.1f} MB/s, "
+            f"busy {self.busy:.2f}s, blocked {self.blocked:.2f}s"
+        )
+
+
+@dataclass
+class PipelineStats:
+    synthesis: StageStats = field(default_factory=lambda: StageStats("synthesis"))
+    encode: StageStats = field(default_factory=lambda: StageStats("encode"))
+    wall: float = 0.0
+
+    def __str__(self):
+        return f"{self.synthesis}\n{self.encode}\nwall {self.wall:.2f}s"
+
+
+_DONE = object()
+
+
+def save_pipelined(
+    videos: Iterable[Any],
+    directory: str,
+    encoder: str | VideoEncoder = "mp4v",
+    writers: int = 1,
+    queue_size: int | None = None,
+    stats: PipelineStats | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> list[str]:
+    """`videos`를 합성하면서 작성 스레드들로 저장하고, 저장한 경로를 순서대로 반환합니다.
+
+    Args:
+        videos (Iterable[VideoData]): 저장할 영상들. 꺼낼 때 합성되는 반복자를 넘깁니다.
+        directory (str): 저장할 디렉토리
+        encoder (str | VideoEncoder): `VideoData.save`에 넘길 인코더
+        writers (int): 작성 스레드 수. 0이면 부르는 스레드에서 차례로 저장합니다.
+        queue_size (int | None): 합성을 마치고 저장을 기다릴 수 있는 영상 수. 없으면 `writers`
+        stats (PipelineStats | None): 처리량을 더해 갈 통계. 없으면 새로 만듭니다.
+        metadata (dict[str, Any] | None): 영상마다 `sample`(영상 번호)을 덧붙여
+            `VideoData.save`에 넘길 메타데이터 한 줄
+    """
+    encoder = get_encoder(encoder)
+    stats = stats if stats is not None else PipelineStats()
+    paths: dict[int, str] = {}
+    start = time.perf_counter()
+
+    def save(video):
+        begin = time.perf_counter()
+        row = None if metadata is None else {**metadata, "sample": video.index}
+        paths[video.index] = video.save(directory, encoder=encoder, metadata=row)
+        stats.encode.add(1, video.data.nbytes, busy=time.perf_counter() - begin)
+
+    if writers <= 0:
+        iterator = iter(videos)
+        while True:
+            begin = time.perf_counter()
+            video = next(iterator, None)
+            if video is None:
+                break
+            stats.synthesis.add(1, video.data.nbytes, busy=time.perf_counter() - begin)
+            save(video)
+        stats.wall += time.perf_counter() - start
+        return [paths[index] for index in sorted(paths)]
+
+    pending: queue.Queue = queue.Queue(maxsize=queue_size or writers)
+    errors: list[BaseException] = []
+
+    def drain():
+        while True:
+            begin = time.perf_counter()
+            video = pending.get()
+            stats.encode.add(blocked=time.perf_counter() - begin)
+            if video is _DONE:
+                return
+            try:
+                if not errors:
+                    save(video)
+            except BaseException as error:
+                errors.append(error)
+
+    threads = [
+        threading.Thread(target=drain, name=f"video-writer-{i}", daemon=True)
+        for i in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        iterator = iter(videos)
+        while not errors:
+            begin = time.perf_counter()
+            video = next(iterator, None)
+            if video is None:
+                break
+            stats.synthesis.add(1, video.data.nbytes, busy=time.perf_counter() - begin)
+
+            # 큐가 가득 차면 여기서 기다립니다.
+            begin = time.perf_counter()
+            pending.put(video)
+            stats.synthesis.add(blocked=time.perf_counter() - begin)
+    finally:
+        for _ in threads:
+            pending.put(_DONE)
+        for thread in threads:
+            thread.join()
+        stats.wall += time.perf_counter() - start
+
+    if errors:
+        raise errors[0]
+    return [paths[index] for index in sorted(paths)]
@@ -0,0 +1,181 @@
+"""여러 영상을 큰 파일 몇 개에 이어 붙여 저장하는 샤드 형식
+
+영상마다 파일을 만들지 않고 `(T, H, W[, C])` uint8 배열을 샤드 파일 끝에 그대로 붙입니다.
+어디에 붙였는지는 `{prefix}.index.jsonl`에 한 줄씩 적으며, 읽을 때는 샤드 파일을
+`np.memmap`으로 열어 복사나 디코딩 없이 원하는 영상을 바로 꺼냅니다.
+
+한 디렉토리에 접두사가 다른 작성기 여러 개가 동시에 쓸 수 있고,
+읽는 쪽은 모든 `*.index.jsonl`을 합쳐서 봅니다.
+"""
+
+from __future__ import annotations
+from dataclasses import asdict, is_dataclass
+from typing import Any, Iterable, Iterator
+from numpy.typing import NDArray
+from pathlib import Path
+import numpy as np
+import json
+import os
+import os.path as osp
+from src.config import DataInfo, DataTask
+from src.data.container import align
+from src.data.generator import DataGenerator
+
+INDEX_SUFFIX = ".index.jsonl"
+
+
+class ShardWriter:
+    def __init__(
+        self, directory: str, prefix: str = "shard", shard_bytes: int = 1 << 30
+    ):
+        """영상을 샤드 파일에 이어 붙이는 작성기
+
+        Args:
+            directory (str): 샤드를 저장할 디렉토리
+            prefix (str): 이 작성기의 파일 이름 접두사. 작성기마다 달라야 합니다.
+            shard_bytes (int): 샤드 파일 하나의 최대 크기. 넘으면 다음 파일로 넘어갑니다.
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_bytes = shard_bytes
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+        # 이어서 쓰는 경우 마지막 샤드 파일부터 계속 씁니다.
+        self._shard = 0
+        while osp.exists(self._shard_path(self._shard + 1)):
+            self._shard += 1
+        path = self._shard_path(self._shard)
+        self._size = osp.getsize(path) if osp.exists(path) else 0
+
+        self._index = open(osp.join(directory, prefix + INDEX_SUFFIX), "a")
+
+    def _shard_name(self, shard: int) -> str:
+        return f"{self.prefix}-{shard:05d}.bin"
+
+    def _shard_path(self, shard: int) -> str:
+        return osp.join(self.directory, self._shard_name(shard))
+
+    def _allocate(self, nbytes: int) -> tuple[str, int]:
+        offset = align(self._size)
+        if offset and offset + nbytes > self.shard_bytes:
+            self._shard += 1
+            offset = 0
+        self._size = offset + nbytes
+
+        path = self._shard_path(self._shard)
+        with open(path, "ab") as f:
+            f.truncate(self._size)
+        return path, offset
+
+    def _commit(
+        self, index: int, path: str, offset: int, shape: tuple[int, ...], metadata: Any
+    ):
+        # 데이터를 다 쓴 뒤에 색인을 적으므로, 중간에 멈춰도 색인에는 온전한 영상만 남습니다.
+        if is_dataclass(metadata):
+            metadata = asdict(metadata)
+        entry = {
+            "index": index,
+            "file": osp.basename(path),
+            "offset": offset,
+            "shape": list(shape),
+            "metadata": metadata,
+        }
+        self._index.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self._index.flush()
+
+    def append(self, index: int, frames: NDArray[np.uint8], metadata: Any = None):
+        """이미 만든 영상 `frames`를 샤드 끝에 붙입니다."""
+        frames = np.ascontiguousarray(frames, dtype=np.uint8)
+        path, offset = self._allocate(frames.nbytes)
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(frames.tobytes())
+        self._commit(index, path, offset, frames.shape, metadata)
+
+    def render(self, index: int, info: DataInfo, metadata: Any = None):
+        """`info`의 영상을 중간 배열 없이 샤드 파일 위에 바로 합성합니다."""
+        shape = DataGenerator.shape(info)
+        path, offset = self._allocate(int(np.prod(shape)))
+        out = np.memmap(path, dtype=np.uint8, mode="r+", offset=offset, shape=shape)
+        DataGenerator.render(info, out=out)
+        out.flush()
+        del out
+        self._commit(index, path, offset, shape, metadata)
+
+    def extend(self, info: Iterable[DataInfo | DataTask]):
+        """`DataGenerator(info)`가 만들 영상들을 같은 번호로 차례로 합성해 붙입니다."""
+        for index, item in enumerate(info):
+            if isinstance(item, DataTask):
+                item = item.build()
+            self.render(index, item)
+
+    def close(self):
+        self._index.close()
+
+    def __enter__(self) -> ShardWriter:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ShardReader:
+    def __init__(self, directory: str):
+        """디렉토리의 모든 샤드를 색인으로 묶어 읽는 리더
+
+        같은 `index`가 여러 번 적혀 있으면 마지막 것을 씁니다.
+
+        Args:
+            directory (str): 샤드가 있는 디렉토리
+        """
+        self.directory = directory
+        self.entries: dict[int, dict[str, Any]] = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(INDEX_SUFFIX):
+                self._read_index(osp.join(directory, name))
+        self._shards: dict[str, np.memmap] = {}
+
+    def _read_index(self, path: str):
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 작성 중에 멈춘 마지막 줄은 건너뜁니다.
+                    continue
+                self.entries[entry["index"]] = entry
+
+    def _shard(self, name: str) -> np.memmap:
+        if name not in self._shards:
+            path = osp.join(self.directory, name)
+            self._shards[name] = np.memmap(path, dtype=np.uint8, mode="r")
+        return self._shards[name]
+
+    def __getstate__(self):
+        # 메모리 맵은 받는 프로세스에서 다시 엽니다.
+        state = self.__dict__.copy()
+        state["_shards"] = {}
+        return state
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.entries
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(self.entries))
+
+    def __getitem__(self, index: int) -> NDArray[np.uint8]:
+        """`index`번 영상을 복사하지 않고 읽기 전용 배열로 반환합니다."""
+        entry = self.entries[index]
+        shape = tuple(entry["shape"])
+        start = entry["offset"]
+        stop = start + int(np.prod(shape))
+        return self._shard(entry["file"])[start:stop].reshape(shape)
+
+    def metadata(self, index: int) -> dict[str, Any] | None:
+        return self.entries[index]["metadata"]
+
+    def __repr__(self):
+        return f"ShardReader({self.directory!r}, videos={len(self)})"
@@ -0,0 +1,428 @@
+"""공유 메모리로 렌더링 워커와 작성 프로세스 사이에 프레임을 넘기는 전송 계층
+
+렌더링 워커가 영상을 저장까지 하면 워커마다 파일 시스템을 두고 다투고,
+영상을 부모 프로세스로 돌려보내면 영상마다 수 MB를 피클링해야 합니다.
+`FrameRing`은 `multiprocessing.shared_memory` 블록 하나를 같은 크기의 칸으로 나눈
+고리 버퍼입니다. 렌더링 워커는 빈 칸을 받아 그 위에 바로 합성하고, 작성 프로세스는
+채워진 칸을 샤드(`ShardWriter`)에 붙인 뒤 칸을 돌려줍니다. 큐로 오가는 것은
+칸 번호, 영상 번호, 모양, 메타데이터뿐입니다.
+
+렌더링 워커에 일을 주는 방법은 두 가지입니다. `render_sweep_to_shards`는 명세를 워커마다
+한 번 넘기고 작업 번호만 보내며, `render_tasks_to_shards`는 `DataTask` 자체를 보냅니다.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import connection, shared_memory
+from typing import Any, Callable, Iterable, Iterator
+from numpy.typing import NDArray
+import multiprocessing as mp
+import queue
+import threading
+import numpy as np
+from tqdm import tqdm
+from src.config import DataTask, task_metadata
+from src.data.generator import DataGenerator
+from src.data.shard import ShardReader, ShardWriter
+from src.runner import (
+    Shard,
+    SweepSpec,
+    available_cpus,
+    make_config,
+    task_costs,
+    task_row,
+    warm_fonts,
+)
+from src.scheduler import Scheduler
+from src.sweep import SweepSpace
+
+_STOP = None
+
+
+class FrameRing:
+    def __init__(self, n_slots: int, slot_bytes: int, context: Any = None):
+        """영상 `n_slots`개를 담는 공유 메모리 고리 버퍼를 만듭니다.
+
+        만든 프로세스가 `close(unlink=True)`로 지워야 합니다. 다른 프로세스에는
+        그대로 넘기면 되고, 받는 쪽에서 같은 블록을 다시 엽니다.
+
+        Args:
+            n_slots (int): 칸 수. 렌더링이 저장보다 이만큼 앞서 나갈 수 있습니다.
+            slot_bytes (int): 칸 하나의 크기. 가장 큰 영상보다 커야 합니다.
+            context: `multiprocessing` 컨텍스트. 없으면 기본 컨텍스트
+        """
+        context = context or mp.get_context()
+        self.n_slots = n_slots
+        self.slot_bytes = slot_bytes
+        self._shm = shared_memory.SharedMemory(create=True, size=n_slots * slot_bytes)
+        self.name = self._shm.name
+
+        self.free = context.Queue()
+        self.filled = context.Queue()
+        self.broken = context.Event()
+        for slot in range(n_slots):
+            self.free.put(slot)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_shm"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = shared_memory.SharedMemory(name=self.name)
+
+    def slot(self, slot: int, shape: tuple[int, ...]) -> NDArray[np.uint8]:
+        """`slot`번 칸을 `shape` 모양의 uint8 배열로 봅니다. 복사하지 않습니다."""
+        if int(np.prod(shape)) > self.slot_bytes:
+            raise ValueError(f"a {shape} video does not fit in {self.slot_bytes} bytes")
+        return np.ndarray(
+            shape, dtype=np.uint8, buffer=self._shm.buf, offset=slot * self.slot_bytes
+        )
+
+    def acquire(self, poll: float = 0.5) -> int:
+        """빈 칸 번호를 받습니다. 모든 칸이 차 있으면 작성 프로세스가 비울 때까지 기다립니다.
+
+        기다리는 동안 `poll`초마다 `abort`가 불렸는지 보고, 불렸으면 `RuntimeError`를 던집니다.
+        """
+        while not self.broken.is_set():
+            try:
+                return self.free.get(timeout=poll)
+            except queue.Empty:
+                continue
+        raise RuntimeError("the frame ring was aborted because a shard writer died")
+
+    def abort(self):
+        """칸을 기다리는 렌더링 워커들이 더 기다리지 않고 실패하게 합니다."""
+        self.broken.set()
+
+    def publish(self, slot: int, index: int, shape: tuple[int, ...], metadata: Any):
+        """`slot`번 칸에 `index`번 영상을 다 그렸다고 알립니다."""
+        self.filled.put((slot, index, tuple(shape), metadata))
+
+    def release(self, slot: int):
+        self.free.put(slot)
+
+    def messages(self) -> Iterator[tuple[int, int, tuple[int, ...], Any]]:
+        """`stop`을 받을 때까지 채워진 칸의 `(칸, 영상 번호, 모양, 메타데이터)`를 돌려줍니다."""
+        while (message := self.filled.get()) is not _STOP:
+            yield message
+
+    def stop(self, n_readers: int = 1):
+        for _ in range(n_readers):
+            self.filled.put(_STOP)
+
+    def close(self, unlink: bool = False):
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+
+def _watch_writers(
+    processes: list[mp.Process], ring: FrameRing, finished: threading.Event
+):
+    """작성 프로세스가 실패로 끝나면 바로 `ring.abort()`를 부릅니다."""
+    sentinels = {process.sentinel: process for process in processes}
+    while sentinels and not finished.is_set():
+        for sentinel in connection.wait(list(sentinels), timeout=0.5):
+            if sentinels.pop(sentinel).exitcode != 0:
+                ring.abort()
+                return
+
+
+def _failed_writers(processes: list[mp.Process]) -> list[str]:
+    return [
+        f"{process.name} (exit code {process.exitcode})"
+        for process in processes
+        if process.exitcode not in (None, 0)
+    ]
+
+
+def drain_to_shards(ring: FrameRing, directory: str, prefix: str, shard_bytes: int):
+    """작성 프로세스의 본체. 채워진 칸을 샤드에 붙이고 칸을 돌려줍니다."""
+    with ShardWriter(directory, prefix=prefix, shard_bytes=shard_bytes) as writer:
+        for slot, index, shape, metadata in ring.messages():
+            try:
+                writer.append(index, ring.slot(slot, shape), metadata)
+            finally:
+                ring.release(slot)
+    ring.close()
+
+
+def sample_offsets(spec: SweepSpec) -> NDArray[np.int64]:
+    """작업마다 첫 영상의 샤드 번호. `t`번 작업의 `s`번째 영상은 `offsets[t] + s`입니다.
+
+    작업마다 `n_position_sample`이 달라도 번호가 겹치지 않도록 누적합으로 매기며,
+    마지막 원소는 전체 영상 수입니다.
+    """
+    space = spec.space()
+    if "n_position_sample" not in space.axes:
+        n_samples = (
+            spec.params(space.point(0))["n_position_sample"] if space.size else 0
+        )
+        return np.arange(space.size + 1, dtype=np.int64) * n_samples
+
+    counts = [
+        spec.params(space.point(index))["n_position_sample"]
+        for index in range(space.size)
+    ]
+    return np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+
+
+# 렌더링 워커마다 한 번만 받아 두는 명세, 공간, 고리 버퍼, 샤드 번호
+_worker_spec: SweepSpec | None = None
+_worker_space: SweepSpace | None = None
+_worker_ring: FrameRing | None = None
+_worker_offsets: NDArray[np.int64] | None = None
+
+
+def _init_render_worker(spec: SweepSpec, ring: FrameRing, offsets: NDArray[np.int64]):
+    global _worker_spec, _worker_space, _worker_ring, _worker_offsets
+    _worker_spec = spec
+    _worker_space = spec.space()
+    _worker_ring = ring
+    _worker_offsets = offsets
+    warm_fonts(_worker_spec, _worker_space)
+
+
+def _render_worker_task(index: int) -> int:
+    params = _worker_spec.params(_worker_space.point(index))
+    infos = make_config(params).build_seeded(index)
+
+    row = task_row(_worker_spec, params, index, _worker_spec.directory)
+    for sample, info in enumerate(infos):
+        slot = _worker_ring.acquire()
+        try:
+            shape = DataGenerator.shape(info)
+            DataGenerator.render(info, out=_worker_ring.slot(slot, shape))
+        except BaseException:
+            _worker_ring.release(slot)
+            raise
+        key = int(_worker_offsets[index]) + sample
+        _worker_ring.publish(slot, key, shape, {**row, "sample": sample})
+    return index
+
+
+def _render_worker_chunk(indices: list[int]) -> list[int]:
+    return [_render_worker_task(index) for index in indices]
+
+
+def _init_task_worker(ring: FrameRing):
+    global _worker_ring
+    _worker_ring = ring
+
+
+def _render_task_chunk(tasks: list[DataTask]) -> list[int]:
+    # 폰트와 노이즈 생성기, 전환기는 명세마다 워커의 캐시에서 한 번만 만듭니다.
+    for task in tasks:
+        info = task.build()
+        slot = _worker_ring.acquire()
+        try:
+            shape = DataGenerator.shape(info)
+            DataGenerator.render(info, out=_worker_ring.slot(slot, shape))
+        except BaseException:
+            _worker_ring.release(slot)
+            raise
+        _worker_ring.publish(slot, task.index, shape, task_metadata(task.index, task))
+    return [task.index for task in tasks]
+
+
+def task_video_bytes(task: DataTask) -> int:
+    """`task`가 만들 영상의 바이트 수. 노이즈를 뽑거나 폰트를 읽지 않고 계산합니다."""
+    width, height = task.video_info.width, task.video_info.height
+    n_frames = min(
+        len(task.text_transition.resolve()), len(task.background_transition.resolve())
+    )
+    return n_frames * int(np.prod(task.background_noise.resolve().shape(width, height)))
+
+
+def max_video_bytes(spec: SweepSpec) -> int:
+    """명세가 만들 수 있는 가장 큰 영상의 바이트 수(컬러 기준)"""
+    space = spec.space()
+
+    def largest(name: str) -> Any:
+        return max(space.axes.get(name, (spec.params(space.point(0))[name],)))
+
+    return largest("fps") * largest("length") * largest("width") * largest("height") * 3
+
+
+def _render_with_writers(
+    ring: FrameRing,
+    directory: str,
+    prefix: str,
+    writers: int,
+    shard_bytes: int,
+    render: Callable[[], None],
+):
+    """작성 프로세스 `writers`개를 띄워 둔 채로 `render()`를 부르고, 끝나면 정리합니다.
+
+    `render`는 렌더링 워커들이 `ring`에 영상을 채우는 동안 돌아오지 않아야 합니다.
+    작성 프로세스가 실패하면 어느 프로세스인지 적은 `RuntimeError`를 던집니다.
+    """
+    processes = [
+        mp.Process(
+            target=drain_to_shards,
+            args=(ring, directory, f"{prefix}-{k}", shard_bytes),
+            name=f"shard-writer-{k}",
+        )
+        for k in range(writers)
+    ]
+    finished = threading.Event()
+    watcher = threading.Thread(
+        target=_watch_writers, args=(processes, ring, finished), daemon=True
+    )
+    try:
+        for process in processes:
+            process.start()
+        # 작성 프로세스가 죽으면 칸이 돌아오지 않아 렌더링 워커가 영영 기다리므로 지켜봅니다.
+        watcher.start()
+        render()
+    except Exception as error:
+        failed = _failed_writers(processes)
+        if failed:
+            raise RuntimeError(f"shard writers failed: {failed}") from error
+        raise
+    finally:
+        finished.set()
+        ring.stop(writers)
+        for process in processes:
+            process.join()
+        if watcher.is_alive():
+            watcher.join()
+        ring.close(unlink=True)
+
+    failed = _failed_writers(processes)
+    if failed:
+        raise RuntimeError(f"shard writers failed: {failed}")
+
+
+def render_sweep_to_shards(
+    spec: SweepSpec,
+    render_workers: int | None = None,
+    writers: int = 1,
+    n_slots: int | None = None,
+    shard_bytes: int = 1 << 30,
+    resume: bool = True,
+    shard: Shard | None = None,
+) -> str:
+    """명세의 영상들을 렌더링 워커 풀에서 만들고, 작성 프로세스들이 샤드로 저장합니다.
+
+    `t`번 작업의 `s`번째 영상은 샤드 번호 `sample_offsets(spec)[t] + s`로 저장되며,
+    메타데이터에는 작업의 메타데이터 한 줄과 `sample`이 들어갑니다.
+    프레임은 `run_sweep`이 저장하는 영상과 같습니다.
+
+    Args:
+        spec (SweepSpec): 실행할 명세. 샤드는 `spec.directory`에 씁니다.
+        render_workers (int | None): 렌더링 워커 수. 없으면 쓸 수 있는 CPU 수에서 `writers`를 뺀 만큼
+        writers (int): 작성 프로세스 수
+        n_slots (int | None): 공유 메모리 칸 수. 없으면 렌더링 워커마다 두 칸
+        shard_bytes (int): 샤드 파일 하나의 최대 크기
+        resume (bool): 샤드 색인에 모든 영상이 있는 작업은 건너뛸지 여부
+        shard (Shard | None): 이 실행이 맡을 몫. 없으면 전체
+    """
+    space: SweepSpace = spec.space()
+    prefix = "writer"
+    if shard is not None:
+        space = space.shard(*shard)
+        prefix = f"writer-{shard}"
+    if render_workers is None:
+        render_workers = max(1, available_cpus() - writers)
+    if n_slots is None:
+        n_slots = 2 * render_workers
+
+    offsets = sample_offsets(spec)
+    pending = [int(index) for index in space.indices]
+    if resume and space.size:
+        try:
+            done = set(ShardReader(spec.directory))
+        except FileNotFoundError:
+            done = set()
+        pending = [
+            index
+            for index in pending
+            if not all(key in done for key in range(offsets[index], offsets[index + 1]))
+        ]
+    print(f"Total Tasks: {len(space)} (done: {len(space) - len(pending)})")
+
+    def render():
+        with ProcessPoolExecutor(
+            max_workers=render_workers,
+            initializer=_init_render_worker,
+            initargs=(spec, ring, offsets),
+        ) as executor:
+            # 비용이 큰 작업부터 나눠 줍니다.
+            scheduler = Scheduler(
+                task_costs(spec, space, pending), workers=render_workers
+            )
+            results = scheduler.run(executor, _render_worker_chunk)
+            for _ in tqdm(results, total=len(pending)):
+                pass
+
+    ring = FrameRing(n_slots, max_video_bytes(spec))
+    _render_with_writers(ring, spec.directory, prefix, writers, shard_bytes, render)
+    return spec.directory
+
+
+def render_tasks_to_shards(
+    tasks: Iterable[DataTask],
+    directory: str,
+    render_workers: int | None = None,
+    writers: int = 1,
+    n_slots: int | None = None,
+    shard_bytes: int = 1 << 30,
+    resume: bool = True,
+    prefix: str = "writer",
+) -> str:
+    """`DataTask`들을 렌더링 워커 풀에서 만들고, 작성 프로세스들이 샤드로 저장합니다.
+
+    `DataGenerationConfig.stream()`을 그대로 넘기면 됩니다. 워커에는 작업 자체를 묶음으로
+    보내며, 작업은 명세와 시드만 담고 있어 하나에 수백 바이트입니다. 영상은 샤드 번호
+    `task.index`로, `task_metadata`를 메타데이터로 저장합니다.
+
+    Args:
+        tasks (Iterable[DataTask]): 만들 작업들
+        directory (str): 샤드를 쓸 디렉토리
+        render_workers (int | None): 렌더링 워커 수. 없으면 쓸 수 있는 CPU 수에서 `writers`를 뺀 만큼
+        writers (int): 작성 프로세스 수
+        n_slots (int | None): 공유 메모리 칸 수. 없으면 렌더링 워커마다 두 칸
+        shard_bytes (int): 샤드 파일 하나의 최대 크기
+        resume (bool): 샤드 색인에 이미 있는 작업은 건너뛸지 여부
+        prefix (str): 작성 프로세스마다 붙는 샤드 파일 이름의 앞부분
+    """
+    tasks = list(tasks)
+    if render_workers is None:
+        render_workers = max(1, available_cpus() - writers)
+    if n_slots is None:
+        n_slots = 2 * render_workers
+
+    pending = tasks
+    if resume:
+        try:
+            done = set(ShardReader(directory))
+        except FileNotFoundError:
+            done = set()
+        pending = [task for task in tasks if task.index not in done]
+    print(f"Total Tasks: {len(tasks)} (done: {len(tasks) - len(pending)})")
+    if not pending:
+        return directory
+
+    costs = {i: float(task_video_bytes(task)) for i, task in enumerate(pending)}
+
+    def render():
+        with ProcessPoolExecutor(
+            max_workers=render_workers,
+            initializer=_init_task_worker,
+            initargs=(ring,),
+        ) as executor:
+            # 큰 영상부터 묶어서 보냅니다. 작업이 작으므로 묶음을 미리 다 넘겨도 됩니다.
+            chunks = Scheduler(costs, workers=render_workers).chunks()
+            results = executor.map(
+                _render_task_chunk, ([pending[i] for i in chunk] for chunk in chunks)
+            )
+            with tqdm(total=len(pending)) as progress:
+                for indices in results:
+                    progress.update(len(indices))
+
+    ring = FrameRing(n_slots, int(max(costs.values())))
+    _render_with_writers(ring, directory, prefix, writers, shard_bytes, render)
+    return directory
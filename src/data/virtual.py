@@ -0,0 +1,170 @@
+"""메타데이터만으로 영상을 다시 만드는 가상 데이터셋
+
+실험 스크립트의 영상은 `Metadata` 한 줄(시드, 속도, 방향, 레이블, 글자 크기, fps,
+노이즈)과 생성 코드로 완전히 정해집니다. `VirtualDataset`은 저장된 영상을 읽는 대신
+같은 시드로 같은 순서의 난수를 뽑아 영상을 그 자리에서 다시 만듭니다.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable
+from numpy.typing import NDArray
+import numpy as np
+import pandas as pd
+import re
+import threading
+from src.config import DataGenerationConfig, DataInfo
+from src.data.generator import DataGenerator
+from src.data.noise import BernoulliNoise, GaussianNoise, NoiseGenerator
+from src.runner import DEFAULT_PARAMS, SweepSpec, make_config
+from src.transition import Direction
+
+Recipe = Callable[[dict[str, Any]], DataGenerationConfig]
+
+# 예전 `BernoulliNoise.__repr__`의 오타("BernolliNoise")도 그대로 읽습니다.
+_NOISES: dict[str, type[NoiseGenerator]] = {
+    "BernoulliNoise": BernoulliNoise,
+    "BernolliNoise": BernoulliNoise,
+    "GaussianNoise": GaussianNoise,
+}
+
+
+def parse_noise(text: str) -> NoiseGenerator:
+    """`repr(noise)` 문자열(`"BernoulliNoise(0.8)"` 등)에서 노이즈 생성기를 만듭니다."""
+    match = re.fullmatch(r"\s*(\w+)\((.*)\)\s*", text)
+    if match is None or match.group(1) not in _NOISES:
+        raise ValueError(f"cannot parse noise {text!r}")
+    args = [float(arg) for arg in match.group(2).split(",") if arg.strip()]
+    return _NOISES[match.group(1)](*args)
+
+
+def default_recipe(row: dict[str, Any], **fixed: Any) -> DataGenerationConfig:
+    """`src.runner.make_config`와 같은 설정을 메타데이터 한 줄로부터 만듭니다.
+
+    `position` 열이 있으면 글자 위치로, `fill` 열이 있으면 `text_fill`로 씁니다.
+    메타데이터에 남지 않는 인자(`moving`, `font_path` 등)는 `fixed`로 넘깁니다.
+    """
+    params = {
+        **DEFAULT_PARAMS,
+        "speed": int(row["move_per_frame"]),
+        "direction": Direction[row["move_direction"]],
+        "label": str(row["label"]),
+        "font_size": float(row["font_size"]),
+        "fps": int(row["fps"]),
+        "length": row["length"],
+        "width": int(row["width"]),
+        "height": int(row["height"]),
+        "noise": parse_noise(row["noise"]),
+        "position": row.get("position", "random"),
+        "text_fill": bool(row.get("fill", False)),
+        **fixed,
+    }
+    return make_config(params)
+
+
+def spec_recipe(spec: SweepSpec) -> Recipe:
+    """`spec`의 고정 인자를 채운 `default_recipe`"""
+    return partial(default_recipe, **spec.fixed)
+
+
+def read_metadata(source: str | pd.DataFrame) -> pd.DataFrame:
+    """메타데이터 CSV/JSONL/Parquet 파일이나 `DataFrame`을 읽습니다."""
+    if isinstance(source, pd.DataFrame):
+        return source.reset_index(drop=True)
+    if source.endswith(".parquet"):
+        return pd.read_parquet(source).reset_index(drop=True)
+    if source.endswith(".jsonl"):
+        return pd.read_json(source, lines=True, dtype=False)
+    # CSV는 각 줄 앞에 이름 없는 번호 열이 있습니다.
+    df = pd.read_csv(source)
+    return df.drop(columns=[c for c in df.columns if c.startswith("Unnamed")])
+
+
+class VirtualDataset:
+    def __init__(
+        self,
+        metadata: str | pd.DataFrame,
+        recipe: Recipe = default_recipe,
+        n_position_sample: int = DEFAULT_PARAMS["n_position_sample"],
+        cache_size: int = 0,
+    ):
+        """메타데이터로부터 영상을 그때그때 다시 만드는 데이터셋
+
+        `i`번째 항목은 `i // n_position_sample`번째 줄의 `i % n_position_sample`번째
+        영상으로, 스크립트가 `{savedat}/{i % n_position_sample}.avi`로 저장했던 영상과 같습니다.
+
+        Args:
+            metadata (str | pd.DataFrame): 메타데이터 CSV/JSONL/Parquet 경로 또는 `DataFrame`
+            recipe (Recipe): 메타데이터 한 줄을 `DataGenerationConfig`로 바꾸는 함수
+            n_position_sample (int): 메타데이터 한 줄이 만드는 영상 수
+            cache_size (int): 최근에 만든 영상을 남겨 둘 개수. 0이면 남기지 않습니다.
+        """
+        self.metadata = read_metadata(metadata)
+        self.recipe = recipe
+        self.n_position_sample = n_position_sample
+        self.cache_size = cache_size
+
+        self._videos: OrderedDict[int, NDArray[np.uint8]] = OrderedDict()
+        # 같은 줄의 영상을 이어서 읽는 경우가 많으므로 마지막 줄의 정보는 남겨 둡니다.
+        self._last_infos: tuple[int, list[DataInfo]] | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.metadata) * self.n_position_sample
+
+    def row(self, index: int) -> dict[str, Any]:
+        """`index`번째 항목의 메타데이터 한 줄"""
+        return self.metadata.iloc[index // self.n_position_sample].to_dict()
+
+    def infos(self, row_index: int) -> list[DataInfo]:
+        """`row_index`번째 줄이 만드는 모든 영상의 `DataInfo`를 스크립트와 같은 난수로 만듭니다."""
+        with self._lock:
+            if self._last_infos is not None and self._last_infos[0] == row_index:
+                return self._last_infos[1]
+
+        row = self.metadata.iloc[row_index].to_dict()
+        config = self.recipe(row)
+        if config.n_position_sample != self.n_position_sample:
+            raise ValueError(
+                f"recipe makes {config.n_position_sample} videos per row, "
+                f"expected {self.n_position_sample}"
+            )
+        infos = config.build_seeded(int(row["seed"]))
+
+        with self._lock:
+            self._last_infos = (row_index, infos)
+        return infos
+
+    def video(self, index: int) -> NDArray[np.uint8]:
+        """`index`번째 영상을 `(T, H, W[, C])` 배열로 만듭니다.
+
+        캐시에 넣은 영상은 호출한 쪽끼리 공유하므로 읽기 전용 배열로 반환합니다.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"index {index} is out of range for {len(self)} videos")
+
+        with self._lock:
+            video = self._videos.get(index)
+            if video is not None:
+                self._videos.move_to_end(index)
+                return video
+
+        row_index, sample = divmod(index, self.n_position_sample)
+        video = DataGenerator.render(self.infos(row_index)[sample])
+
+        if self.cache_size:
+            # 한 호출자가 고친 값이 다음 호출자에게 보이지 않도록 막습니다.
+            video.setflags(write=False)
+            with self._lock:
+                self._videos[index] = video
+                while len(self._videos) > self.cache_size:
+                    self._videos.popitem(last=False)
+        return video
+
+    def __getitem__(self, index: int) -> tuple[NDArray[np.uint8], dict[str, Any]]:
+        """`index`번째 영상과 그 메타데이터를 반환합니다."""
+        return self.video(index), self.row(index)
+
+    def __repr__(self):
+        return f"VirtualDataset(rows={len(self.metadata)}, videos={len(self)})"
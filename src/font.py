@@ -0,0 +1,86 @@
+from __future__ import annotations
+from functools import lru_cache
+from PIL import ImageFont, Image, ImageDraw
+
+FontLike = ImageFont.ImageFont | ImageFont.FreeTypeFont
+
+# 아틀라스 등에서 미리 읽어 둔 글자 크기. 키는 `font_key`의 (경로, 크기)에 글자를 붙인 것입니다.
+_preloaded: dict[tuple[str, int, str], tuple[tuple[float, ...], float]] = {}
+
+
+def font_key(font: FontLike) -> tuple[str, int] | None:
+    """파일에서 불러온 트루타입 폰트면 `(경로, 크기)`를, 아니면 `None`을 반환합니다."""
+    if isinstance(font, ImageFont.FreeTypeFont) and isinstance(font.path, str):
+        return (font.path, int(font.size))
+    return None
+
+
+@lru_cache(maxsize=256)
+def load_font(path: str | None, size: int) -> ImageFont.FreeTypeFont:
+    """`path`의 트루타입 폰트를 `size` 크기로 불러옵니다.
+
+    같은 `(path, size)`는 프로세스마다 한 번만 불러오고, 이후에는 같은 객체를 돌려줍니다.
+    `path`가 `None`이면 Pillow 기본 폰트를 불러옵니다.
+    """
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+def _measure_bbox(text: str, font: FontLike) -> tuple[float, float, float, float]:
+    if "\n" in text or not isinstance(font, ImageFont.FreeTypeFont):
+        # 여러 줄 텍스트나 비트맵 폰트는 ImageDraw에 맡깁니다. 이미지 크기는 상관없습니다.
+        draw = ImageDraw.Draw(Image.new("L", (1, 1), 0))
+        return draw.textbbox((0, 0), text, font=font)
+    # "L" 이미지의 ImageDraw.textbbox((0, 0), ...)와 같은 값입니다.
+    return font.getbbox(text, "L")
+
+
+@lru_cache(maxsize=4096)
+def _cached_bbox(path: str, size: int, text: str) -> tuple[float, float, float, float]:
+    return _measure_bbox(text, load_font(path, size))
+
+
+@lru_cache(maxsize=4096)
+def _cached_length(path: str, size: int, text: str) -> float:
+    return load_font(path, size).getlength(text)
+
+
+def preload_metrics(
+    path: str,
+    size: int,
+    text: str,
+    bbox: tuple[float, float, float, float],
+    length: float,
+):
+    """미리 재 둔 글자 크기를 등록해, 이후에는 FreeType 없이 돌려주도록 합니다.
+
+    `path`는 `load_font`에 넘기는 경로 그대로여야 하며, 그 경로의 폰트에만 쓰입니다.
+    """
+    _preloaded[(path, size, text)] = (bbox, length)
+
+
+def _lookup_preloaded(text: str, key: tuple[str, int]):
+    return _preloaded.get((*key, text))
+
+
+def text_bbox(text: str, font: FontLike) -> tuple[float, float, float, float]:
+    """`(0, 0)`에 그린 `text`의 `(left, top, right, bottom)`을 이미지 없이 계산합니다."""
+    key = font_key(font)
+    if key is None:
+        return _measure_bbox(text, font)
+    preloaded = _lookup_preloaded(text, key)
+    if preloaded is not None:
+        return preloaded[0]
+    return _cached_bbox(*key, text)
+
+
+def text_length(text: str, font: FontLike) -> float:
+    """`text`의 가로 길이(`font.getlength`)를 캐시해서 반환합니다."""
+    key = font_key(font)
+    if key is None:
+        return font.getlength(text)
+    preloaded = _lookup_preloaded(text, key)
+    if preloaded is not None:
+        return preloaded[1]
+    return _cached_length(*key, text)
@@ -0,0 +1,249 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import NamedTuple, Sequence
+from PIL import ImageFont, Image, ImageDraw
+from numpy.typing import NDArray
+import numpy as np
+import math
+import threading
+from src.font import font_key
+
+
+class Glyph(NamedTuple):
+    """원점에 그린 글자의 마스크
+
+    `mask`는 글자가 칠해진 영역만 잘라 낸 것이고, `offset`은 그리기 시작한
+    정수 좌표에서 `mask`의 왼쪽 위까지의 거리입니다.
+    """
+
+    mask: NDArray[np.bool_]
+    offset: tuple[int, int]
+
+
+def rasterize(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    start: tuple[float, float] = (0.0, 0.0),
+) -> Glyph:
+    """`ImageDraw.text`와 똑같은 방식으로 글자 하나를 잘라 낸 마스크로 그립니다.
+
+    `ImageDraw.text`는 좌표의 소수 부분을 `start`로 넘겨 글자를 그린 뒤
+    정수 부분에 붙여 넣으므로, 같은 `start`로 그리면 결과가 픽셀 단위로 같습니다.
+    """
+    bitmap, offset = font.getmask2(text, "L", ink=1, start=start, stroke_filled=True)
+    canvas = Image.new("L", bitmap.size, 0)
+    ImageDraw.Draw(canvas).draw.draw_bitmap((0, 0), bitmap, 1)
+    return Glyph(mask=np.array(canvas).astype(np.bool_), offset=offset)
+
+
+class MaskROI(NamedTuple):
+    """프레임 안에서 글자가 칠해질 수 있는 사각형과 그 안의 마스크
+
+    `mask`는 `frame[rows, cols]`와 모양이 같습니다.
+    """
+
+    mask: NDArray[np.bool_]
+    rows: slice
+    cols: slice
+
+
+def _clip(
+    glyph: Glyph, origin: tuple[int, int], width: int, height: int
+) -> tuple[slice, slice, slice, slice]:
+    """글자 마스크가 프레임과 겹치는 부분을 프레임 쪽 슬라이스와 마스크 쪽 슬라이스로 반환합니다."""
+    glyph_height, glyph_width = glyph.mask.shape
+    left = origin[0] + glyph.offset[0]
+    top = origin[1] + glyph.offset[1]
+
+    # 화면 밖으로 나간 부분은 잘라 냅니다.
+    x0, y0 = max(left, 0), max(top, 0)
+    x1, y1 = min(left + glyph_width, width), min(top + glyph_height, height)
+    x1, y1 = max(x1, x0), max(y1, y0)
+    return (
+        slice(y0, y1),
+        slice(x0, x1),
+        slice(y0 - top, y1 - top),
+        slice(x0 - left, x1 - left),
+    )
+
+
+def place(
+    glyph: Glyph,
+    origin: tuple[int, int],
+    width: int,
+    height: int,
+    out: NDArray[np.bool_] | None = None,
+) -> NDArray[np.bool_]:
+    """`glyph`를 정수 좌표 `origin`에 놓은 `(height, width)` 마스크를 만듭니다."""
+    if out is None:
+        out = np.zeros((height, width), dtype=np.bool_)
+    else:
+        out.fill(False)
+
+    rows, cols, glyph_rows, glyph_cols = _clip(glyph, origin, width, height)
+    out[rows, cols] = glyph.mask[glyph_rows, glyph_cols]
+    return out
+
+
+# FreeType은 펜 위치를 1/64 픽셀(26.6 고정소수점) 단위로 다룹니다.
+SUBPIXEL = 64
+
+
+def quantize_start(start: tuple[float, float]) -> tuple[int, int]:
+    """`start`를 FreeType이 실제로 쓰는 1/64 픽셀 격자로 반올림합니다.
+
+    같은 칸에 드는 `start`는 모두 같은 픽셀에 그려집니다.
+    """
+    return (
+        math.floor(start[0] * SUBPIXEL + 0.5),
+        math.floor(start[1] * SUBPIXEL + 0.5),
+    )
+
+
+def pen_shift(grid: tuple[int, int]) -> tuple[int, int]:
+    """격자점 `grid`에서 시작할 때 글자 하나의 비트맵이 원점에서 옮겨지는 픽셀 수
+
+    Pillow는 글자 비트맵을 26.6 펜 위치를 픽셀로 반올림한 곳에 붙이며,
+    y는 아래 방향이 음수인 FreeType 좌표에서 반올림합니다.
+    """
+    half = SUBPIXEL // 2
+    dx = (grid[0] + half) // SUBPIXEL
+    dy = -((half - grid[1]) // SUBPIXEL)
+    return dx, dy
+
+
+class GlyphCache:
+    def __init__(self, maxsize: int = 1 << 14):
+        """글자 마스크 캐시
+
+        (글자, 폰트 파일, 크기)마다 원점에 한 번만 래스터화해 두고,
+        새 위치의 마스크는 배열을 옮겨 붙여서 만듭니다.
+        좌표에 소수 부분이 있으면 그 소수 부분을 1/64 픽셀 격자로 반올림해
+        캐시하므로, 무작위 위치를 뽑아도 글자마다 많아야 64×64개만 남습니다.
+
+        Args:
+            maxsize (int): 캐시에 남겨 둘 글자 마스크의 최대 개수
+        """
+        self.maxsize = maxsize
+        self._glyphs: OrderedDict[tuple, Glyph] = OrderedDict()
+        self._atlases: list = []
+        self._lock = threading.Lock()
+
+    def attach(self, atlas):
+        """원점 마스크를 FreeType 대신 읽어 올 `GlyphAtlas`를 등록합니다."""
+        self._atlases.append(atlas)
+
+    def _from_atlas(
+        self, text: str, path: str, size: int, grid: tuple[int, int]
+    ) -> Glyph | None:
+        # 아틀라스에는 원점에 그린 마스크만 있습니다. 글자가 하나면 비트맵도 하나이므로
+        # 펜 위치를 반올림한 만큼 옮기면 `grid`에서 그린 것과 같아집니다.
+        # 음수 좌표에서는 Pillow가 비트맵 가장자리를 잘라 내므로 직접 그립니다.
+        if grid != (0, 0) and (len(text) != 1 or min(grid) < 0):
+            return None
+        for atlas in self._atlases:
+            if atlas.covers(path):
+                glyph = atlas.glyph(text, size)
+                if glyph is not None:
+                    dx, dy = pen_shift(grid)
+                    offset = (glyph.offset[0] + dx, glyph.offset[1] + dy)
+                    return Glyph(mask=glyph.mask, offset=offset)
+        return None
+
+    def glyph(
+        self,
+        text: str,
+        font: ImageFont.FreeTypeFont,
+        start: tuple[float, float] = (0.0, 0.0),
+    ) -> Glyph:
+        """`start`만큼 어긋나게 그린 `text`의 마스크를 캐시에서 꺼내거나 새로 그립니다."""
+        font_id = font_key(font)
+        if font_id is None:
+            return rasterize(text, font, start)
+
+        grid = quantize_start(start)
+        key = (text, *font_id, grid)
+        with self._lock:
+            glyph = self._glyphs.get(key)
+            if glyph is not None:
+                self._glyphs.move_to_end(key)
+                return glyph
+
+        glyph = self._from_atlas(text, *font_id, grid)
+        if glyph is None:
+            # 격자점에서 그려도 원래 `start`로 그린 것과 같은 픽셀이 칠해집니다.
+            glyph = rasterize(text, font, (grid[0] / SUBPIXEL, grid[1] / SUBPIXEL))
+        with self._lock:
+            self._glyphs[key] = glyph
+            while len(self._glyphs) > self.maxsize:
+                self._glyphs.popitem(last=False)
+        return glyph
+
+    def mask(
+        self,
+        position: tuple[float, float],
+        width: int,
+        height: int,
+        text: str,
+        font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+        out: NDArray[np.bool_] | None = None,
+    ) -> NDArray[np.bool_]:
+        """`ImageDraw.text(position, text)`로 칠해지는 픽셀의 마스크를 반환합니다."""
+        if not isinstance(font, ImageFont.FreeTypeFont):
+            # 비트맵 폰트는 예전처럼 전체 이미지에 그립니다.
+            canvas = Image.new("L", (width, height), 0)
+            ImageDraw.Draw(canvas).text(xy=position, text=text, font=font, fill=1)
+            mask = np.array(canvas).astype(np.bool_)
+            if out is None:
+                return mask
+            out[...] = mask
+            return out
+
+        x, y = position
+        start = (math.modf(x)[0], math.modf(y)[0])
+        glyph = self.glyph(text, font, start)
+        return place(glyph, (int(x), int(y)), width, height, out=out)
+
+    def roi(
+        self,
+        position: tuple[float, float],
+        width: int,
+        height: int,
+        text: str,
+        font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+    ) -> MaskROI:
+        """`mask`와 같은 마스크를 글자가 있는 사각형만 잘라 반환합니다."""
+        if not isinstance(font, ImageFont.FreeTypeFont):
+            mask = self.mask(position, width, height, text, font)
+            ys, xs = np.nonzero(mask)
+            if ys.size == 0:
+                return MaskROI(mask[:0, :0], slice(0, 0), slice(0, 0))
+            rows = slice(int(ys.min()), int(ys.max()) + 1)
+            cols = slice(int(xs.min()), int(xs.max()) + 1)
+            return MaskROI(mask[rows, cols], rows, cols)
+
+        x, y = position
+        start = (math.modf(x)[0], math.modf(y)[0])
+        glyph = self.glyph(text, font, start)
+        rows, cols, glyph_rows, glyph_cols = _clip(
+            glyph, (int(x), int(y)), width, height
+        )
+        return MaskROI(glyph.mask[glyph_rows, glyph_cols], rows, cols)
+
+    def masks(
+        self,
+        positions: Sequence[tuple[float, float]] | NDArray[np.floating],
+        width: int,
+        height: int,
+        text: str,
+        font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+    ) -> NDArray[np.bool_]:
+        """여러 위치의 마스크를 `(N, height, width)` 배열 하나로 반환합니다."""
+        out = np.empty((len(positions), height, width), dtype=np.bool_)
+        for i, (x, y) in enumerate(positions):
+            self.mask((float(x), float(y)), width, height, text, font, out=out[i])
+        return out
+
+
+# 프로세스 전체가 함께 쓰는 캐시
+GLYPH_CACHE = GlyphCache()
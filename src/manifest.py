@@ -0,0 +1,175 @@
+"""실험 작업의 완료 기록
+
+`run_sweep`은 작업 하나가 끝날 때마다 그 번호, 작업 인자의 지문, 만든 파일의 크기와
+SHA-256, 메타데이터 한 줄을 `manifest.jsonl`에 덧붙입니다. 파일을 다 쓴 뒤에 기록하므로
+실행이 중간에 멈춰도 기록에는 온전히 끝난 작업만 남고, 다시 실행하면 그 작업들을 건너뜁니다.
+명세를 바꿔 같은 디렉토리에 다시 실행하면 지문이 달라진 작업은 새로 만듭니다.
+"""
+
+from __future__ import annotations
+from typing import Any, Iterable, Iterator
+import hashlib
+import json
+import os
+import os.path as osp
+
+MANIFEST_PREFIX = "manifest"
+MANIFEST_NAME = f"{MANIFEST_PREFIX}.jsonl"
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """파일의 SHA-256 16진 문자열"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_files(root: str, paths: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """`root`에 대한 상대 경로마다 파일 크기와 SHA-256을 적은 딕셔너리"""
+    return {
+        osp.relpath(path, root): {
+            "size": osp.getsize(path),
+            "sha256": file_digest(path),
+        }
+        for path in paths
+    }
+
+
+def _ends_mid_line(path: str) -> bool:
+    if not osp.isfile(path) or osp.getsize(path) == 0:
+        return False
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+class Manifest:
+    def __init__(self, directory: str, name: str = MANIFEST_NAME):
+        """`directory`의 완료 기록을 읽고 이어서 적습니다.
+
+        샤드마다 다른 파일(`manifest-00000-of-00004.jsonl` 등)에 적더라도 읽을 때는
+        디렉토리의 모든 `manifest*.jsonl`을 합쳐서 봅니다.
+        같은 번호가 여러 번 적혀 있으면 마지막 것을 씁니다.
+
+        Args:
+            directory (str): 실험 결과 디렉토리. 기록의 파일 경로는 여기에 대한 상대 경로입니다.
+            name (str): 이 실행이 적을 기록 파일 이름
+        """
+        self.directory = directory
+        self.path = osp.join(directory, name)
+        self.entries: dict[int, dict[str, Any]] = {}
+        # 이 실행이 적을 파일이 쓰다 멈춘 줄로 끝나는지.
+        # 그 뒤에 바로 이어 적으면 새로 적는 줄까지 깨지므로 줄을 바꾸고 적습니다.
+        self._torn = _ends_mid_line(self.path)
+        if osp.isdir(directory):
+            for file in sorted(os.listdir(directory)):
+                if file.startswith(MANIFEST_PREFIX) and file.endswith(".jsonl"):
+                    self._read(osp.join(directory, file))
+
+    def _read(self, path: str):
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록하다 멈춘 마지막 줄은 건너뜁니다.
+                    continue
+                self.entries[entry["index"]] = entry
+
+    def verify(
+        self, index: int, hash: bool = True, fingerprint: str | None = None
+    ) -> bool:
+        """`index`번 작업의 파일이 기록과 같은지 확인합니다.
+
+        Args:
+            index (int): 작업 번호
+            hash (bool): 크기뿐 아니라 SHA-256까지 비교할지 여부
+            fingerprint (str | None): 지금 명세로 만들 작업의 지문. 주면 기록된 지문과도 비교합니다.
+        """
+        entry = self.entries.get(index)
+        if entry is None:
+            return False
+        if fingerprint is not None and entry.get("fingerprint") != fingerprint:
+            return False
+        for name, expected in entry["files"].items():
+            path = osp.join(self.directory, name)
+            if not osp.isfile(path) or osp.getsize(path) != expected["size"]:
+                return False
+            if hash and file_digest(path) != expected["sha256"]:
+                return False
+        return True
+
+    def completed(
+        self,
+        hash: bool = True,
+        indices: Iterable[int] | None = None,
+        fingerprints: dict[int, str] | None = None,
+    ) -> set[int]:
+        """파일이 모두 온전한 작업 번호들. 확인에 실패한 작업은 기록에서 뺍니다.
+
+        Args:
+            hash (bool): 크기뿐 아니라 SHA-256까지 비교할지 여부
+            indices (Iterable[int] | None): 확인할 작업 번호. 없으면 기록된 모든 작업
+            fingerprints (dict[int, str] | None): 작업 번호마다 지금 명세로 만들 작업의 지문.
+                주면 지문이 다르거나 없는 작업도 끝나지 않은 것으로 봅니다.
+        """
+        indices = self.entries.keys() if indices is None else set(indices)
+        checked = [index for index in self.entries if index in indices]
+        failed = {
+            index
+            for index in checked
+            if not self.verify(
+                index,
+                hash=hash,
+                fingerprint=None if fingerprints is None else fingerprints[index],
+            )
+        }
+        for index in failed:
+            del self.entries[index]
+        return set(checked) - failed
+
+    def rows(self, indices: Iterable[int] | None = None) -> Iterator[dict[str, Any]]:
+        """기록된 메타데이터를 작업 번호 순서로 돌려줍니다.
+
+        Args:
+            indices (Iterable[int] | None): 돌려줄 작업 번호. 없으면 기록된 모든 작업
+        """
+        wanted = self.entries.keys() if indices is None else set(indices)
+        for index in sorted(self.entries):
+            if index not in wanted:
+                continue
+            # JSON은 튜플을 리스트로 적으므로 되돌립니다.
+            yield {
+                key: tuple(value) if isinstance(value, list) else value
+                for key, value in self.entries[index]["row"].items()
+            }
+
+    def record(
+        self,
+        index: int,
+        files: dict[str, dict[str, Any]],
+        row: dict[str, Any],
+        fingerprint: str | None = None,
+    ):
+        """끝난 작업 하나를 기록 파일 끝에 덧붙이고 디스크에 내려 씁니다."""
+        entry = {"index": index, "fingerprint": fingerprint, "files": files, "row": row}
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "a") as f:
+            if self._torn:
+                f.write("\n")
+                self._torn = False
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[index] = entry
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"Manifest({self.path!r}, tasks={len(self)})"
@@ -0,0 +1,211 @@
+"""실험 메타데이터를 모아서 한꺼번에 쓰는 작성기
+
+`MetadataWriter`는 줄을 버퍼에 모았다가 `batch_size`개마다 한 번에 씁니다.
+확장자로 형식을 고릅니다.
+
+- `.csv`: 머리줄은 한 번만 쓰고, 각 줄 앞에 이름 없는 번호 열을 둡니다(`pd.read_csv(index_col=0)`).
+- `.jsonl`: 한 줄에 JSON 객체 하나
+- `.parquet`: 닫을 때 표 전체를 씁니다. `pandas`와 `pyarrow`는 이때 불러옵니다.
+
+`Metadata` 하위 클래스들을 함께 넘기면 모든 열을 합친 스키마로 씁니다.
+"""
+
+from __future__ import annotations
+from dataclasses import asdict, fields, is_dataclass
+from typing import Any, Iterable, Sequence
+import csv
+import io
+import json
+import os
+import os.path as osp
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def schema_of(*classes: type) -> list[str]:
+    """데이터클래스들의 필드 이름을 처음 나온 순서대로 합칩니다."""
+    columns: list[str] = []
+    for cls in classes:
+        for f in fields(cls):
+            if f.name not in columns:
+                columns.append(f.name)
+    return columns
+
+
+def _format_of(path: str) -> str:
+    ext = osp.splitext(path)[1].lstrip(".").lower()
+    if ext not in FORMATS:
+        raise ValueError(f"unknown metadata format {ext!r}, expected one of {FORMATS}")
+    return ext
+
+
+def _truncate_torn_line(path: str):
+    # 쓰다가 멈춰 줄바꿈으로 끝나지 않은 마지막 줄을 잘라 냅니다.
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+
+class MetadataWriter:
+    def __init__(
+        self,
+        path: str,
+        schema: Sequence[str] | type | Iterable[type] | None = None,
+        batch_size: int = 1024,
+        append: bool = False,
+    ):
+        """메타데이터 줄을 모아 `path`에 쓰는 작성기
+
+        `append=False`면 임시 파일에 쓰고 닫을 때 `path`를 한 번에 바꿔치기하므로,
+        읽는 쪽은 이전 파일이나 완성된 새 파일만 봅니다.
+        `append=True`면 기존 파일 끝에 묶음 단위로 덧붙이며, 중간에 잘린 마지막 줄은 지웁니다.
+
+        Args:
+            path (str): 저장할 경로. 확장자가 `.csv`, `.jsonl`, `.parquet` 중 하나여야 합니다.
+            schema: 열 이름 목록이나 `Metadata` 클래스(들). 없으면 첫 줄의 키를 씁니다.
+            batch_size (int): 한 번에 쓸 줄 수
+            append (bool): 기존 파일에 이어 쓸지 여부. Parquet은 지원하지 않습니다.
+        """
+        self.path = path
+        self.format = _format_of(path)
+        self.batch_size = batch_size
+        self.append = append
+
+        if schema is None:
+            self.columns: list[str] | None = None
+        elif isinstance(schema, type):
+            self.columns = schema_of(schema)
+        else:
+            schema = list(schema)
+            if all(isinstance(column, str) for column in schema):
+                self.columns = schema
+            else:
+                self.columns = schema_of(*schema)
+
+        if append and self.format == "parquet":
+            raise ValueError("parquet metadata cannot be appended")
+
+        parent = osp.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._target = path if append else f"{path}.tmp"
+        self._n_rows = 0
+        if append and osp.exists(path):
+            _truncate_torn_line(path)
+            self._resume()
+        elif not append and osp.exists(self._target):
+            os.remove(self._target)
+
+        self._buffer: list[dict[str, Any]] = []
+        self._table: list[dict[str, Any]] = []
+        self._closed = False
+
+    def _resume(self):
+        with open(self.path, encoding="utf-8", newline="") as f:
+            if self.format == "csv":
+                lines = list(csv.reader(f))
+                if lines:
+                    columns = lines[0][1:]
+                    if self.columns is not None and self.columns != columns:
+                        raise ValueError(
+                            f"{self.path} has columns {columns}, expected {self.columns}"
+                        )
+                    self.columns = columns
+                    self._n_rows = len(lines) - 1
+            else:
+                self._n_rows = sum(1 for line in f if line.strip())
+
+    def _normalize(self, row: Any) -> dict[str, Any]:
+        if is_dataclass(row):
+            row = asdict(row)
+        if self.columns is None:
+            self.columns = list(row)
+        unknown = set(row) - set(self.columns)
+        if unknown:
+            raise ValueError(f"columns {sorted(unknown)} are not in the schema")
+        return {column: row.get(column) for column in self.columns}
+
+    def write(self, row: Any):
+        """데이터클래스나 딕셔너리 한 줄을 버퍼에 넣습니다. 스키마에 없는 열은 비워 둡니다."""
+        self._buffer.append(self._normalize(row))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[Any]):
+        for row in rows:
+            self.write(row)
+
+    def _encode(self, rows: list[dict[str, Any]]) -> str:
+        buffer = io.StringIO()
+        if self.format == "csv":
+            writer = csv.writer(buffer, lineterminator="\n")
+            if self._n_rows == 0:
+                writer.writerow(["", *self.columns])
+            for i, row in enumerate(rows, start=self._n_rows):
+                writer.writerow([i, *row.values()])
+        else:
+            for row in rows:
+                buffer.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        return buffer.getvalue()
+
+    def flush(self):
+        """버퍼의 줄들을 한 번의 쓰기로 파일에 덧붙이고 디스크에 내려 씁니다."""
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+
+        if self.format == "parquet":
+            self._table.extend(rows)
+            return
+
+        text = self._encode(rows)
+        with open(self._target, "a", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self._n_rows += len(rows)
+
+    def _write_parquet(self):
+        import pandas as pd
+
+        df = pd.DataFrame(self._table, columns=self.columns)
+        df.to_parquet(self._target, index=False)
+
+    def close(self):
+        """남은 줄을 쓰고, 새로 쓰던 파일이면 `path` 자리로 옮깁니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+
+        if self.format == "parquet":
+            self._write_parquet()
+        elif not osp.exists(self._target):
+            # 줄이 하나도 없어도 머리줄만 있는 파일을 남깁니다.
+            with open(self._target, "w", encoding="utf-8", newline="") as f:
+                if self.format == "csv" and self.columns is not None:
+                    csv.writer(f, lineterminator="\n").writerow(["", *self.columns])
+
+        if not self.append:
+            os.replace(self._target, self.path)
+
+    def __len__(self) -> int:
+        return self._n_rows + len(self._table) + len(self._buffer)
+
+    def __enter__(self) -> MetadataWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and not self.append:
+            # 실패한 실행이 온전한 이전 파일을 덮어쓰지 않게 합니다.
+            self._closed = True
+            if osp.exists(self._target):
+                os.remove(self._target)
+            return
+        self.close()
+
+    def __repr__(self):
+        return f"MetadataWriter({self.path!r}, rows={len(self)})"
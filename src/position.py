@@ -0,0 +1,197 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import NamedTuple, TypeAlias
+from PIL import ImageFont
+from numpy.typing import NDArray
+import numpy as np
+from src.font import text_bbox
+
+Position: TypeAlias = tuple[float, float]
+
+
+class Bounds(NamedTuple):
+    """글자가 잘리지 않도록 그리기 시작할 수 있는 좌표의 범위"""
+
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+        width: int,
+        height: int,
+    ) -> Bounds:
+        bbox = text_bbox(text, font)
+
+        # 왼쪽 위를 기준으로 계산
+        return cls(
+            x_min=-bbox[0],
+            x_max=width - bbox[2],
+            y_min=-bbox[1],
+            y_max=height - bbox[3],
+        )
+
+    @property
+    def low(self) -> NDArray[np.float64]:
+        return np.array([self.x_min, self.y_min], dtype=np.float64)
+
+    @property
+    def span(self) -> NDArray[np.float64]:
+        return np.array(
+            [self.x_max - self.x_min, self.y_max - self.y_min], dtype=np.float64
+        )
+
+
+def _uniform(n: int, rng: np.random.Generator | None) -> NDArray[np.float64]:
+    # 전역 난수는 np.random.rand()를 x, y 순서로 n번 부른 것과 같은 값을 냅니다.
+    if rng is None:
+        return np.random.random_sample((n, 2))
+    return rng.random((n, 2))
+
+
+class PositionSampler(ABC):
+    """글자 위치를 한꺼번에 뽑는 샘플러
+
+    호출하면 위치 하나를 반환하므로 기존의 위치 함수 자리에 그대로 쓸 수 있습니다.
+    """
+
+    @abstractmethod
+    def sample(
+        self, n: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.float64]:
+        """위치 `n`개를 `(n, 2)` 배열로 반환합니다.
+
+        `rng`가 없으면 전역 난수(`np.random`)를 씁니다.
+        """
+
+    def __call__(self) -> Position:
+        x, y = self.sample(1)[0]
+        return (float(x), float(y))
+
+    def positions(
+        self, n: int, rng: np.random.Generator | None = None
+    ) -> list[Position]:
+        """`sample`의 결과를 `(x, y)` 튜플의 리스트로 반환합니다."""
+        return [(x, y) for x, y in self.sample(n, rng).tolist()]
+
+
+class UniformPosition(PositionSampler):
+    def __init__(self, bounds: Bounds):
+        """범위 안에서 균등하게 뽑는 위치
+
+        Args:
+            bounds (Bounds): 위치의 범위
+        """
+        self.bounds = bounds
+
+    def sample(
+        self, n: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.float64]:
+        out = _uniform(n, rng)
+        out *= self.bounds.span
+        out += self.bounds.low
+        return out
+
+    def __repr__(self):
+        return f"UniformPosition{tuple(self.bounds)}"
+
+
+class GridPosition(PositionSampler):
+    def __init__(self, bounds: Bounds, columns: int, rows: int):
+        """범위를 `columns`×`rows` 칸으로 나눈 각 칸의 가운데
+
+        난수를 쓰지 않으며, 왼쪽 위 칸부터 행 순서로 돌아가며 반환합니다.
+
+        Args:
+            bounds (Bounds): 위치의 범위
+            columns (int): 가로 칸 수
+            rows (int): 세로 칸 수
+        """
+        if columns < 1 or rows < 1:
+            raise ValueError(f"grid must have at least one cell, got {columns}x{rows}")
+        self.bounds = bounds
+        self.columns = columns
+        self.rows = rows
+
+    def cells(self) -> NDArray[np.float64]:
+        """모든 칸의 `(column, row)` 번호를 행 순서로 반환합니다."""
+        rows, columns = np.divmod(np.arange(self.columns * self.rows), self.columns)
+        return np.stack([columns, rows], axis=1).astype(np.float64)
+
+    def sample(
+        self, n: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.float64]:
+        cells = self.cells()
+        out = cells[np.arange(n) % len(cells)] + 0.5
+        out *= self.bounds.span / (self.columns, self.rows)
+        out += self.bounds.low
+        return out
+
+    def __repr__(self):
+        return f"GridPosition({tuple(self.bounds)}, {self.columns}, {self.rows})"
+
+
+class StratifiedPosition(GridPosition):
+    def __init__(self, bounds: Bounds, columns: int, rows: int):
+        """범위를 `columns`×`rows` 칸으로 나누고 칸마다 균등하게 뽑는 위치
+
+        `GridPosition`과 같은 순서로 칸을 돌며, 칸 안의 위치만 무작위로 정합니다.
+        `n`이 칸 수의 배수이면 모든 칸에 같은 개수가 들어갑니다.
+
+        Args:
+            bounds (Bounds): 위치의 범위
+            columns (int): 가로 칸 수
+            rows (int): 세로 칸 수
+        """
+        super().__init__(bounds, columns, rows)
+
+    def sample(
+        self, n: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.float64]:
+        cells = self.cells()
+        out = cells[np.arange(n) % len(cells)]
+        out += _uniform(n, rng)
+        out *= self.bounds.span / (self.columns, self.rows)
+        out += self.bounds.low
+        return out
+
+    def __repr__(self):
+        return f"StratifiedPosition({tuple(self.bounds)}, {self.columns}, {self.rows})"
+
+
+class CenteredPosition(PositionSampler):
+    def __init__(self, position: Position):
+        """항상 같은 위치. 난수를 쓰지 않습니다.
+
+        Args:
+            position (Position): 반환할 위치
+        """
+        self.position = position
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+        width: int,
+        height: int,
+    ) -> CenteredPosition:
+        """글자의 bbox가 화면 가운데에 오는 위치를 만듭니다."""
+        bbox = text_bbox(text, font)
+
+        x = (width - (bbox[2] - bbox[0])) / 2 - bbox[0]
+        y = (height - (bbox[3] - bbox[1])) / 2 - bbox[1]
+
+        return cls((x, y))
+
+    def sample(
+        self, n: int, rng: np.random.Generator | None = None
+    ) -> NDArray[np.float64]:
+        return np.tile(np.asarray(self.position, dtype=np.float64), (n, 1))
+
+    def __repr__(self):
+        return f"CenteredPosition({self.position})"
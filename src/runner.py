@@ -0,0 +1,617 @@
+"""선언적인 명세로 실험 데이터를 만드는 실행기
+
+`scripts/*.py`는 각자 `SweepSpec` 하나만 정의하고 `run_sweep`에 넘깁니다.
+축의 데카르트 곱마다 작업 하나가 만들어지며, 작업 `index`는 예전 스크립트처럼
+`np.random.seed(index)`로 시작하므로 같은 명세는 같은 영상을 만듭니다.
+"""
+
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+import argparse
+import hashlib
+import json
+from dataclasses import dataclass, field, make_dataclass, replace
+from typing import Any, Callable, NamedTuple, Sequence
+import os
+import os.path as osp
+import shutil
+import time
+from tqdm import tqdm
+from src.atlas import GlyphAtlas, font_name, use_atlas
+from src.config import DataGenerationConfig
+from src.data.generator import DataGenerator
+from src.data.noise import BernoulliNoise, NoiseGenerator
+from src.manifest import MANIFEST_PREFIX, Manifest, describe_files
+from src.metadata import MetadataWriter
+from src.scheduler import Scheduler, task_cost
+from src.sweep import SweepSpace
+from src.transition import Direction, LinearTransition, NoTransition
+from src.utils import (
+    Metadata,
+    get_centered_position,
+    get_position_builder,
+    get_sized_fonts,
+)
+
+BINARY = ("0", "1")
+QUAD = ("A", "B", "C", "D")
+
+# 명세의 `fixed`나 축으로 덮어쓸 수 있는 작업 인자의 기본값
+DEFAULT_PARAMS: dict[str, Any] = {
+    "speed": 1,
+    "direction": Direction.DOWN,
+    "label": "0",
+    "font_size": 0.2,
+    "fps": 10,
+    "length": 2,
+    "width": 224,
+    "height": 224,
+    "font_path": "resources/malgun.ttf",
+    "n_position_sample": 9,
+    "noise": None,  # 없으면 `BernoulliNoise(noise_level)`
+    "noise_level": 0.8,
+    "position": "random",  # "random" 또는 "centered"
+    "text_fill": False,
+    "moving": "text",  # 선형 이동을 적용할 층: "text" 또는 "background"
+}
+
+
+def noise_of(params: dict[str, Any]) -> NoiseGenerator:
+    if params["noise"] is not None:
+        return params["noise"]
+    return BernoulliNoise(params["noise_level"])
+
+
+def noise_name(params: dict[str, Any]) -> str:
+    """메타데이터의 `noise` 열에 적을 이름"""
+    if params["noise"] is not None:
+        return repr(params["noise"])
+    return f"BernoulliNoise({params['noise_level']})"
+
+
+def make_config(params: dict[str, Any]) -> DataGenerationConfig:
+    """작업 인자로부터 영상 `n_position_sample`개의 설정을 만듭니다."""
+    width = params["width"]
+    height = params["height"]
+    text = params["label"]
+    total_frames = params["fps"] * params["length"]
+
+    font = get_sized_fonts(
+        width=width,
+        font_path=params["font_path"],
+        text=text,
+        percent=params["font_size"],
+    )
+    if params["position"] == "centered":
+        position = get_centered_position(
+            text=text, font=font, width=width, height=height
+        )
+    elif params["position"] == "random":
+        position = get_position_builder(
+            text=text, font=font, width=width, height=height
+        )
+    else:
+        raise ValueError(f"unknown position {params['position']!r}")
+
+    moving = LinearTransition(
+        direction=params["direction"], total_frames=total_frames, mpf=params["speed"]
+    )
+    still = NoTransition(total_frames=total_frames)
+    if params["moving"] == "text":
+        text_transition, background_transition = moving, still
+    elif params["moving"] == "background":
+        text_transition, background_transition = still, moving
+    else:
+        raise ValueError(f"unknown moving layer {params['moving']!r}")
+
+    return DataGenerationConfig(
+        text=text,
+        font=font,
+        text_position=position,
+        noise_generator=noise_of(params),
+        text_transition=text_transition,
+        n_position_sample=params["n_position_sample"],
+        background_transition=background_transition,
+        width=width,
+        height=height,
+        fps=params["fps"],
+        length=params["length"],
+        text_fill=params["text_fill"],
+    )
+
+
+@dataclass
+class SweepSpec:
+    """실험 하나의 명세
+
+    Args:
+        name (str): 실험 이름. 기본 저장 위치는 `data/{name}`입니다.
+        axes (dict[str, Sequence[Any]]): 훑을 축. 이름은 `DEFAULT_PARAMS`의 키입니다.
+        fixed (dict[str, Any]): 기본값 대신 쓸 고정 인자
+        metadata (dict[str, str]): `Metadata`에 덧붙일 열 이름과 그 값을 가져올 인자 이름
+        output (str | None): 저장 위치. 없으면 `data/{name}`
+        encoder (str): `VideoData.save`에 넘길 인코더 이름
+        metadata_file (str): 메타데이터 파일 이름. 확장자로 `MetadataWriter`의 형식을 고릅니다.
+        writers (int): 작업마다 합성과 겹쳐 인코딩할 작성 스레드 수. 0이면 차례로 저장합니다.
+        atlas (str | None): 워커가 FreeType 대신 글자 마스크를 읽을 `GlyphAtlas` 파일 경로
+    """
+
+    name: str
+    axes: dict[str, Sequence[Any]]
+    fixed: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, str] = field(default_factory=dict)
+    output: str | None = None
+    encoder: str = "mp4v"
+    metadata_file: str = "metadata.csv"
+    writers: int = 1
+    atlas: str | None = None
+
+    def __post_init__(self):
+        unknown = (set(self.axes) | set(self.fixed)) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"unknown sweep parameters: {sorted(unknown)}")
+
+    @property
+    def directory(self) -> str:
+        return self.output if self.output is not None else osp.join("data", self.name)
+
+    @property
+    def metadata_path(self) -> str:
+        return osp.join(self.directory, self.metadata_file)
+
+    def shard_metadata_path(self, shard: Shard) -> str:
+        """`shard`가 따로 쓰는 메타데이터 조각의 경로"""
+        stem, ext = osp.splitext(self.metadata_file)
+        return osp.join(self.directory, f"{stem}-{shard}{ext}")
+
+    def space(self) -> SweepSpace:
+        return SweepSpace(**self.axes)
+
+    def params(self, point: Any) -> dict[str, Any]:
+        return {**DEFAULT_PARAMS, **self.fixed, **point._asdict()}
+
+    def metadata_class(self) -> type[Metadata]:
+        """`metadata` 열을 덧붙인 `Metadata` 하위 클래스"""
+        if not self.metadata:
+            return Metadata
+        return make_dataclass(
+            f"{type(self).__name__}Metadata",
+            [(column, Any) for column in self.metadata],
+            bases=(Metadata,),
+        )
+
+
+class Shard(NamedTuple):
+    """`n_shards`개로 나눈 작업 중 `index`번째 몫"""
+
+    index: int
+    n_shards: int
+
+    @classmethod
+    def parse(cls, text: str) -> Shard:
+        """`"i/N"` 형식의 문자열을 읽습니다."""
+        try:
+            index, n_shards = (int(part) for part in text.split("/"))
+        except ValueError:
+            raise ValueError(f"shard must look like 'i/N', got {text!r}") from None
+        if not 0 <= index < n_shards:
+            raise ValueError(f"shard {index} is out of range for {n_shards}")
+        return cls(index, n_shards)
+
+    @classmethod
+    def from_slurm(cls) -> Shard | None:
+        """SLURM 배열 작업이면 환경 변수에서 몫을 읽고, 아니면 `None`을 반환합니다.
+
+        `--array=0-15:2`나 `--array=1,5,9`처럼 번호가 연속하지 않는 배열은
+        몫이 겹치거나 비므로 받지 않습니다.
+        """
+        task_id = _slurm_int("SLURM_ARRAY_TASK_ID")
+        if task_id is None:
+            return None
+        # `--array=1-16`처럼 0에서 시작하지 않는 배열도 0부터 세도록 맞춥니다.
+        task_min = _slurm_int("SLURM_ARRAY_TASK_MIN") or 0
+        task_max = _slurm_int("SLURM_ARRAY_TASK_MAX")
+        count = _slurm_int("SLURM_ARRAY_TASK_COUNT")
+        if count is None:
+            if task_max is None:
+                raise ValueError(
+                    "SLURM_ARRAY_TASK_ID is set but neither SLURM_ARRAY_TASK_COUNT "
+                    "nor SLURM_ARRAY_TASK_MAX is; pass --shard i/N instead"
+                )
+            count = task_max - task_min + 1
+        elif task_max is not None and task_max - task_min + 1 != count:
+            raise ValueError(
+                f"SLURM array {task_min}-{task_max} has {count} tasks; "
+                "use a contiguous --array range or pass --shard i/N"
+            )
+
+        if count <= 0:
+            raise ValueError(f"SLURM_ARRAY_TASK_COUNT must be positive, got {count}")
+        index = task_id - task_min
+        if not 0 <= index < count:
+            raise ValueError(
+                f"SLURM_ARRAY_TASK_ID={task_id} is out of range for "
+                f"SLURM_ARRAY_TASK_MIN={task_min} and {count} tasks"
+            )
+        return cls(index, count)
+
+    def __str__(self):
+        return f"{self.index:05d}-of-{self.n_shards:05d}"
+
+
+def _slurm_int(name: str) -> int | None:
+    """정수여야 하는 SLURM 환경 변수를 읽습니다. 없으면 `None`을 반환합니다."""
+    value = os.environ.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+
+class TaskResult(NamedTuple):
+    index: int
+    row: dict[str, Any]
+    files: list[str]
+
+
+def run_task(spec: SweepSpec, space: SweepSpace, index: int) -> TaskResult:
+    """`index`번 작업의 영상들을 저장하고 메타데이터 한 줄과 저장한 파일들을 반환합니다."""
+    params = spec.params(space.point(index))
+    directory = osp.join(spec.directory, str(index))
+
+    # 이전 실행이 중간에 멈추며 남긴 파일을 지우고 새로 만듭니다.
+    if osp.isdir(directory):
+        shutil.rmtree(directory)
+
+    # `make_config`의 전환기는 렌더링 중에 난수를 뽑지 않으므로 렌더링은 잠금 밖에서 합니다.
+    infos = make_config(params).build_seeded(index)
+
+    row = task_row(spec, params, index, directory)
+    files = DataGenerator(infos).save(
+        directory, encoder=spec.encoder, writers=spec.writers, metadata=row
+    )
+
+    return TaskResult(index, row, files)
+
+
+def task_fingerprint(spec: SweepSpec, params: dict[str, Any]) -> str:
+    """작업 인자와 인코더로 정해지는 지문. 같으면 같은 파일이 만들어집니다."""
+    # 노이즈 생성기 같은 객체는 repr로 적습니다. repr이 주소를 담으면 매번 다시 만듭니다.
+    key = {**params, "encoder": spec.encoder}
+    text = json.dumps(key, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def task_row(
+    spec: SweepSpec, params: dict[str, Any], index: int, savedat: str
+) -> dict[str, Any]:
+    """`index`번 작업의 메타데이터 한 줄"""
+    label = params["label"]
+    row = {
+        "move_per_frame": params["speed"],
+        "move_direction": params["direction"].name,
+        "label": label,
+        "options": BINARY if label in BINARY else QUAD,
+        "fps": params["fps"],
+        "font_size": params["font_size"],
+        "length": params["length"],
+        "width": params["width"],
+        "height": params["height"],
+        "noise": noise_name(params),
+        "seed": index,
+        "savedat": savedat,
+    }
+    for column, name in spec.metadata.items():
+        row[column] = params[name]
+    return row
+
+
+# 워커 프로세스마다 한 번만 받아 두는 명세와 공간
+_worker_spec: SweepSpec | None = None
+_worker_space: SweepSpace | None = None
+
+
+@lru_cache(maxsize=None)
+def _use_atlas(path: str) -> GlyphAtlas:
+    # 프로세스마다 한 번만 열어 글자 캐시에 등록합니다.
+    return use_atlas(path)
+
+
+def warm_fonts(spec: SweepSpec, space: SweepSpace):
+    """작업마다 폰트를 불러오고 글자 크기를 재지 않도록 미리 캐시에 올려 둡니다.
+
+    명세에 아틀라스가 있으면 먼저 열어 글자 마스크와 크기를 거기서 읽게 합니다.
+    """
+    if space.size == 0:
+        return
+    params = spec.params(space.point(0))
+    if spec.atlas is not None:
+        atlas = _use_atlas(spec.atlas)
+        for font_path in space.axes.get("font_path", (params["font_path"],)):
+            if font_name(font_path) == atlas.font:
+                atlas.register(font_path)
+    for label in space.axes.get("label", (params["label"],)):
+        for font_size in space.axes.get("font_size", (params["font_size"],)):
+            get_sized_fonts(
+                width=params["width"],
+                font_path=params["font_path"],
+                text=label,
+                percent=font_size,
+            )
+
+
+def _init_worker(spec: SweepSpec):
+    global _worker_spec, _worker_space
+    _worker_spec = spec
+    _worker_space = spec.space()
+    warm_fonts(_worker_spec, _worker_space)
+
+
+def _run_chunk(
+    spec: SweepSpec, space: SweepSpace, indices: list[int]
+) -> list[tuple[int, dict[str, Any], dict[str, Any]]]:
+    results = []
+    for index in indices:
+        result = run_task(spec, space, index)
+        # 해시는 워커에서 계산해 메인 프로세스는 기록만 합니다.
+        files = describe_files(spec.directory, result.files)
+        results.append((index, result.row, files))
+    return results
+
+
+def _run_worker_chunk(
+    indices: list[int],
+) -> list[tuple[int, dict[str, Any], dict[str, Any]]]:
+    return _run_chunk(_worker_spec, _worker_space, indices)
+
+
+BACKENDS = ("process", "thread")
+
+
+def _executor(
+    spec: SweepSpec, backend: str, max_workers: int
+) -> tuple[Executor, Callable[[list[int]], list]]:
+    if backend == "process":
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(spec,)
+        )
+        return executor, _run_worker_chunk
+    if backend == "thread":
+        # 스레드들은 폰트/글자 캐시와 노이즈 생성기를 이 프로세스 하나에서 함께 씁니다.
+        space = spec.space()
+        warm_fonts(spec, space)
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sweep-worker"
+        )
+        return executor, partial(_run_chunk, spec, space)
+    raise ValueError(f"unknown backend {backend!r}, expected one of {BACKENDS}")
+
+
+def _report_usage(backend: str, elapsed: float, n_tasks: int):
+    """처리량과 최대 메모리 사용량을 출력합니다. 프로세스 풀이면 워커 중 가장 큰 값을 함께 봅니다."""
+    line = f"Backend: {backend}, {n_tasks} tasks in {elapsed:.1f}s"
+    if elapsed > 0:
+        line += f" ({n_tasks / elapsed:.2f} tasks/s)"
+    try:
+        import resource
+    except ImportError:
+        print(line)
+        return
+    # Linux에서 ru_maxrss의 단위는 KB입니다.
+    main_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    line += f", peak RSS: main {main_rss:.0f} MB"
+    if backend == "process":
+        worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        line += f", largest worker {worker_rss:.0f} MB"
+    print(line)
+
+
+def _ready() -> bool:
+    return True
+
+
+def task_costs(
+    spec: SweepSpec, space: SweepSpace, indices: list[int]
+) -> dict[int, float]:
+    """작업 번호마다의 상대 비용(`src.scheduler.task_cost`)"""
+    return {index: task_cost(spec.params(space.point(index))) for index in indices}
+
+
+def task_fingerprints(spec: SweepSpec, space: SweepSpace) -> dict[int, str]:
+    """`space`의 작업 번호마다의 지문(`task_fingerprint`)"""
+    return {
+        int(index): task_fingerprint(spec, spec.params(space.point(index)))
+        for index in space.indices
+    }
+
+
+def available_cpus() -> int:
+    """이 프로세스가 쓸 수 있는 CPU 수. SLURM 같은 스케줄러가 허용한 CPU만 셉니다."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run_sweep(
+    spec: SweepSpec,
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+    resume: bool = True,
+    verify: bool = True,
+    shard: Shard | None = None,
+    tune_workers: bool = False,
+    backend: str = "process",
+) -> str:
+    """명세의 모든 작업을 워커 풀에서 실행하고 메타데이터 파일 경로를 반환합니다.
+
+    끝난 작업은 `Manifest`에 기록하며, 다시 실행하면 기록된 작업 중 파일이 온전한 것은
+    건너뛰고 나머지만 실행합니다. `metadata.csv`는 마지막에 기록으로부터 다시 씁니다.
+
+    `shard`를 주면 `SweepSpace.shard`로 고른 작업만 실행하고, 기록과 메타데이터를
+    샤드 이름이 붙은 파일에 따로 씁니다. 시드는 전체 작업 번호이므로 몇 개로 나누든
+    같은 영상이 나오며, 모든 샤드가 끝난 뒤 `merge_shards`로 메타데이터를 합칩니다.
+
+    작업은 `Scheduler`가 비용이 큰 것부터, 남은 비용에 맞춰 묶음 크기를 줄여 가며 나눠 줍니다.
+
+    Args:
+        spec (SweepSpec): 실행할 명세
+        max_workers (int | None): 워커 수. 없으면 쓸 수 있는 CPU 수
+        chunksize (int | None): 워커에 한 번에 넘길 작업 수. 없으면 남은 비용에 맞춰 정합니다.
+        resume (bool): 끝난 작업을 건너뛸지 여부. `False`면 기록을 지우고 처음부터 실행합니다.
+        verify (bool): 건너뛰기 전에 파일의 SHA-256까지 확인할지 여부. `False`면 크기만 봅니다.
+        shard (Shard | None): 이 실행이 맡을 몫. 없으면 전체
+        tune_workers (bool): 처음 몇 작업으로 워커 수별 처리량을 재서, `max_workers` 이하에서
+            가장 나은 워커 수로 나머지를 실행할지 여부
+        backend (str): `"process"`면 프로세스 풀, `"thread"`면 스레드 풀에서 실행합니다.
+            스레드 풀은 인터프리터와 폰트/글자 캐시를 하나만 두며, 전역 난수를 쓰는
+            부분만 `LEGACY_RNG_LOCK`으로 한 번에 하나씩 실행합니다. 결과는 같습니다.
+    """
+    space = spec.space()
+    metadata_path = spec.metadata_path
+    manifest_name = f"{MANIFEST_PREFIX}.jsonl"
+    if shard is not None:
+        space = space.shard(*shard)
+        metadata_path = spec.shard_metadata_path(shard)
+        manifest_name = f"{MANIFEST_PREFIX}-{shard}.jsonl"
+
+    manifest = Manifest(spec.directory, name=manifest_name)
+    fingerprints = task_fingerprints(spec, space)
+    if resume:
+        done = manifest.completed(
+            hash=verify, indices=space.indices, fingerprints=fingerprints
+        )
+    else:
+        if osp.exists(manifest.path):
+            os.remove(manifest.path)
+        done = set()
+
+    pending = [int(index) for index in space.indices if index not in done]
+    print(f"Total Tasks: {len(space)} (done: {len(space) - len(pending)})")
+
+    if max_workers is None:
+        max_workers = available_cpus()
+    scheduler = Scheduler(
+        task_costs(spec, space, pending), workers=max_workers, chunksize=chunksize
+    )
+
+    if pending:
+        start = time.perf_counter()
+        executor, run_chunk = _executor(spec, backend, max_workers)
+        with executor:
+            if tune_workers:
+                # 워커를 모두 띄운 뒤에 재야 초기화 시간이 섞이지 않습니다.
+                for future in [executor.submit(_ready) for _ in range(max_workers)]:
+                    future.result()
+            results = scheduler.run(executor, run_chunk, tune=tune_workers)
+            for index, row, files in tqdm(results, total=len(pending)):
+                manifest.record(index, files, row, fingerprint=fingerprints[index])
+
+        if scheduler.throughput:
+            print(f"Workers: {scheduler.workers} (throughput: {scheduler.throughput})")
+        _report_usage(backend, time.perf_counter() - start, len(pending))
+
+    # 이어서 실행해도 같은 파일이 나오도록 기록 전체를 작업 번호 순서로 다시 씁니다.
+    with MetadataWriter(metadata_path, schema=spec.metadata_class()) as writer:
+        writer.write_many(manifest.rows(space.indices))
+    return metadata_path
+
+
+def merge_shards(spec: SweepSpec, verify: bool = False) -> str:
+    """샤드들의 기록을 합쳐 명세 전체의 메타데이터 파일을 쓰고 그 경로를 반환합니다.
+
+    작업 번호 순서로 쓰므로 한 번에 실행한 `run_sweep`과 같은 파일이 나옵니다.
+
+    Args:
+        spec (SweepSpec): 합칠 명세
+        verify (bool): 파일의 SHA-256까지 확인할지 여부. `False`면 크기만 봅니다.
+    """
+    space = spec.space()
+    manifest = Manifest(spec.directory)
+    done = manifest.completed(
+        hash=verify, indices=space.indices, fingerprints=task_fingerprints(spec, space)
+    )
+
+    missing = len(space) - len(done)
+    if missing:
+        raise ValueError(
+            f"{missing} of {len(space)} tasks are not finished; rerun their shards"
+        )
+
+    with MetadataWriter(spec.metadata_path, schema=spec.metadata_class()) as writer:
+        writer.write_many(manifest.rows(space.indices))
+    return spec.metadata_path
+
+
+def main(spec: SweepSpec, argv: Sequence[str] | None = None):
+    """실험 스크립트의 명령줄 진입점
+
+    `--shard`가 없어도 SLURM 배열 작업 안이면 `SLURM_ARRAY_TASK_ID`로 몫을 정합니다.
+    """
+    parser = argparse.ArgumentParser(description=f"{spec.name} 데이터를 만듭니다.")
+    parser.add_argument(
+        "--shard",
+        type=Shard.parse,
+        default=None,
+        help="전체 작업을 N개로 나눈 것 중 i번째(0부터)만 실행합니다. 예: 3/16",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="샤드들이 남긴 기록을 합쳐 메타데이터 파일 하나를 씁니다.",
+    )
+    parser.add_argument(
+        "--workers",
+        default=None,
+        help="워커 프로세스 수. auto면 처음 몇 작업으로 재서 정합니다.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="process",
+        help="작업을 돌릴 풀. thread는 한 프로세스 안의 스레드들로 실행합니다.",
+    )
+    parser.add_argument(
+        "--to-shards",
+        action="store_true",
+        help="영상 파일 대신 공유 메모리를 거쳐 샤드 파일에 저장합니다.",
+    )
+    parser.add_argument(
+        "--atlas",
+        default=None,
+        help="글자 마스크를 FreeType 대신 읽을 아틀라스 파일(`python -m src.atlas`로 만듭니다)",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="끝난 작업도 다시 만듭니다."
+    )
+    args = parser.parse_args(argv)
+    if args.atlas is not None:
+        spec = replace(spec, atlas=args.atlas)
+
+    if args.merge:
+        print(merge_shards(spec))
+        return
+
+    tune = args.workers == "auto"
+    workers = None if args.workers in (None, "auto") else int(args.workers)
+
+    shard = args.shard if args.shard is not None else Shard.from_slurm()
+    if shard is not None:
+        print(f"Shard: {shard.index}/{shard.n_shards}")
+    if args.to_shards:
+        from src.data.transport import render_sweep_to_shards
+
+        render_sweep_to_shards(
+            spec, render_workers=workers, resume=not args.restart, shard=shard
+        )
+        return
+    run_sweep(
+        spec,
+        max_workers=workers,
+        resume=not args.restart,
+        shard=shard,
+        tune_workers=tune,
+        backend=args.backend,
+    )
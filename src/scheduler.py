@@ -0,0 +1,136 @@
+"""작업 비용을 보고 나눠 주는 스케줄러
+
+작업 비용은 fps·길이·해상도·위치 수에 따라 몇 배씩 차이가 납니다. 큰 작업이 마지막에
+걸리면 다른 코어가 노는 동안 그 작업 하나를 기다리게 되므로, `Scheduler`는
+
+- 큰 작업부터 나눠 주고(longest job first),
+- 남은 비용에 맞춰 묶음 크기를 줄여 가며(guided self-scheduling),
+- 원하면 처음 몇 작업으로 워커 수별 처리량을 재서 가장 나은 워커 수를 고릅니다.
+
+재는 동안 실행한 작업의 결과도 그대로 돌려주므로 버리는 작업은 없습니다.
+"""
+
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Iterable, Iterator, Sequence
+import time
+
+
+def task_cost(params: dict[str, Any]) -> float:
+    """작업 하나의 상대 비용. 프레임 수 × 픽셀 수 × 위치 수입니다."""
+    frames = params["fps"] * params["length"]
+    pixels = params["width"] * params["height"]
+    return float(frames * pixels * params["n_position_sample"])
+
+
+class Scheduler:
+    def __init__(
+        self,
+        costs: dict[int, float],
+        workers: int,
+        chunksize: int | None = None,
+        rounds: int = 4,
+    ):
+        """작업 번호별 비용 `costs`로 묶음을 만들어 실행기에 나눠 주는 스케줄러
+
+        Args:
+            costs (dict[int, float]): 작업 번호마다의 상대 비용
+            workers (int): 동시에 돌릴 묶음 수(워커 수). `tune`이면 이것이 상한입니다.
+            chunksize (int | None): 묶음 하나의 작업 수를 고정합니다. 없으면 남은 비용을
+                `rounds * workers`로 나눈 만큼씩 묶습니다.
+            rounds (int): 남은 작업을 워커마다 몇 묶음쯤으로 나눌지
+        """
+        self.costs = costs
+        self.workers = workers
+        self.chunksize = chunksize
+        self.rounds = rounds
+        # 비용이 같으면 작업 번호 순서를 유지합니다.
+        self.order = sorted(costs, key=lambda index: (-costs[index], index))
+        self.throughput: dict[int, float] = {}
+
+    def chunks(self, order: Sequence[int] | None = None) -> Iterator[list[int]]:
+        """큰 작업부터 묶음을 만듭니다. 묶음의 비용은 남은 비용에 비례해 줄어듭니다."""
+        order = self.order if order is None else order
+        if self.chunksize is not None:
+            for start in range(0, len(order), self.chunksize):
+                yield list(order[start : start + self.chunksize])
+            return
+
+        remaining = sum(self.costs[index] for index in order)
+        chunk: list[int] = []
+        chunk_cost = 0.0
+        for index in order:
+            chunk.append(index)
+            chunk_cost += self.costs[index]
+            if chunk_cost >= remaining / (self.rounds * self.workers):
+                yield chunk
+                remaining -= chunk_cost
+                chunk, chunk_cost = [], 0.0
+        if chunk:
+            yield chunk
+
+    def run(
+        self,
+        executor: Executor,
+        fn: Callable[[list[int]], Iterable[Any]],
+        tune: bool = False,
+    ) -> Iterator[Any]:
+        """묶음마다 `fn(묶음)`을 실행하고, 그 결과들을 끝나는 대로 하나씩 돌려줍니다.
+
+        실행기에는 `workers`개 묶음만 넘겨 두므로, 실행기의 워커가 더 많아도
+        동시에 도는 것은 `workers`개입니다.
+
+        Args:
+            executor (Executor): 실행기. 워커 수가 `workers` 이상이어야 합니다.
+            fn (Callable[[list[int]], Iterable[Any]]): 묶음을 실행하고 결과들을 반환하는 함수
+            tune (bool): 먼저 워커 수를 1, 2, 4, ...로 늘려 가며 처리량을 재고 `workers`를 정할지 여부
+        """
+        order = self.order
+        if tune:
+            order = yield from self._calibrate(executor, fn, order)
+
+        chunks = self.chunks(order)
+        running: set[Future] = set()
+        while True:
+            for chunk in chunks:
+                running.add(executor.submit(fn, chunk))
+                if len(running) >= self.workers:
+                    break
+            if not running:
+                return
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield from future.result()
+
+    def _calibrate(
+        self,
+        executor: Executor,
+        fn: Callable[[list[int]], Iterable[Any]],
+        order: list[int],
+    ) -> Iterator[Any]:
+        candidates = []
+        n = 1
+        while n < self.workers:
+            candidates.append(n)
+            n *= 2
+        candidates.append(self.workers)
+
+        # 재는 데 작업이 모자라면 상한을 그대로 씁니다.
+        if sum(candidates) * 2 > len(order):
+            return order
+
+        for n in candidates:
+            batch, order = order[:n], order[n:]
+            start = time.perf_counter()
+            futures = [executor.submit(fn, [index]) for index in batch]
+            for future in futures:
+                yield from future.result()
+            elapsed = time.perf_counter() - start
+            self.throughput[n] = sum(self.costs[index] for index in batch) / elapsed
+
+        # 가장 빠른 것과 5% 안쪽이면 워커가 적은 쪽을 고릅니다.
+        best = max(self.throughput.values())
+        self.workers = min(
+            n for n, rate in self.throughput.items() if rate >= 0.95 * best
+        )
+        return order
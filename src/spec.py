@@ -0,0 +1,139 @@
+"""프로세스 사이에 싸게 넘길 수 있는 명세
+
+폰트 객체, 노이즈 생성기, 전환기 대신 그 이름과 인자만 담은 작은 튜플을 넘기고,
+받은 프로세스에서 `resolve`/`load`를 부를 때 실제 객체로 바꿉니다.
+같은 명세는 프로세스마다 한 번만 만들고 이후에는 캐시된 객체를 돌려줍니다.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any, NamedTuple
+from numpy.typing import NDArray
+from PIL import ImageFont
+import numpy as np
+from src.data.noise import BernoulliNoise, GaussianNoise, NoiseGenerator
+from src.font import load_font
+from src.transition import LinearTransition, NoiseOnly, NoTransition, Transition
+
+_NOISES: dict[str, type[NoiseGenerator]] = {
+    cls.__name__: cls for cls in (BernoulliNoise, GaussianNoise)
+}
+_TRANSITIONS: dict[str, type[Transition]] = {
+    cls.__name__: cls for cls in (LinearTransition, NoTransition, NoiseOnly)
+}
+
+
+def register_noise(cls: type[NoiseGenerator]) -> type[NoiseGenerator]:
+    """`NoiseSpec`으로 주고받을 수 있도록 노이즈 생성기 클래스를 등록합니다.
+
+    생성자 인자와 같은 이름의 속성에 인자를 그대로 저장하는 클래스여야 합니다.
+    """
+    _NOISES[cls.__name__] = cls
+    return cls
+
+
+def register_transition(cls: type[Transition]) -> type[Transition]:
+    """`TransitionSpec`으로 주고받을 수 있도록 전환기 클래스를 등록합니다.
+
+    생성자 인자와 같은 이름의 속성에 인자를 그대로 저장하는 클래스여야 합니다.
+    """
+    _TRANSITIONS[cls.__name__] = cls
+    return cls
+
+
+class FontSpec(NamedTuple):
+    """폰트 객체 대신 들고 다니는 폰트 명세
+
+    `path`가 `None`이면 Pillow 기본 폰트를 뜻합니다.
+    """
+
+    path: str | None
+    size: int
+
+    @classmethod
+    def from_font(cls, font: ImageFont.FreeTypeFont | ImageFont.ImageFont) -> FontSpec:
+        if not isinstance(font, ImageFont.FreeTypeFont):
+            raise TypeError(f"cannot describe {type(font).__name__} as a FontSpec")
+        path = font.path if isinstance(font.path, str) else None
+        return cls(path=path, size=int(font.size))
+
+    def load(self) -> ImageFont.FreeTypeFont:
+        return load_font(self.path, self.size)
+
+
+class NoiseSpec(NamedTuple):
+    """노이즈 생성기와, 있으면 그 노이즈 한 장을 뽑을 시드
+
+    `params`는 `TransitionSpec`처럼 `(인자 이름, 값)` 쌍들입니다. `BernoulliNoise(0.8)`은
+    `NoiseSpec("BernoulliNoise", (("p", 0.8),))`입니다.
+    """
+
+    kind: str
+    params: tuple[tuple[str, Any], ...]
+    seed: np.random.SeedSequence | None = None
+
+    @classmethod
+    def from_noise(
+        cls, noise: NoiseGenerator, seed: np.random.SeedSequence | None = None
+    ) -> NoiseSpec:
+        kind = type(noise).__name__
+        if _NOISES.get(kind) is not type(noise):
+            raise TypeError(f"{kind} is not registered as a noise generator")
+        return cls(kind, tuple(vars(noise).items()), seed)
+
+    def resolve(self) -> NoiseGenerator:
+        """노이즈 생성기. 시드와 무관하게 프로세스마다 한 번만 만듭니다."""
+        return _noise(self.kind, self.params)
+
+    def with_seed(self, seed: np.random.SeedSequence | None) -> NoiseSpec:
+        return self._replace(seed=seed)
+
+    def generate(self, width: int, height: int) -> NDArray[np.uint8]:
+        """`seed`로 만든 생성기에서 노이즈 한 장을 뽑습니다."""
+        if self.seed is None:
+            raise ValueError("a NoiseSpec needs a seed to generate noise")
+        rng = np.random.default_rng(self.seed)
+        return self.resolve()(width=width, height=height, rng=rng)
+
+
+@lru_cache(maxsize=None)
+def _noise(kind: str, params: tuple[tuple[str, Any], ...]) -> NoiseGenerator:
+    return _NOISES[kind](**dict(params))
+
+
+def _to_spec(value: Any) -> Any:
+    return NoiseSpec.from_noise(value) if isinstance(value, NoiseGenerator) else value
+
+
+def _from_spec(value: Any) -> Any:
+    return value.resolve() if isinstance(value, NoiseSpec) else value
+
+
+class TransitionSpec(NamedTuple):
+    """전환기 명세. `params`는 `(인자 이름, 값)` 쌍들입니다.
+
+    노이즈 생성기 인자는 `NoiseSpec`으로 바꿔 담습니다.
+    """
+
+    kind: str
+    params: tuple[tuple[str, Any], ...]
+
+    @classmethod
+    def from_transition(cls, transition: Transition) -> TransitionSpec:
+        kind = type(transition).__name__
+        if _TRANSITIONS.get(kind) is not type(transition):
+            raise TypeError(f"{kind} is not registered as a transition")
+        params = tuple(
+            (name, _to_spec(value)) for name, value in vars(transition).items()
+        )
+        return cls(kind, params)
+
+    def resolve(self) -> Transition:
+        """전환기. 같은 명세는 프로세스마다 한 번만 만듭니다."""
+        return _transition(self)
+
+
+@lru_cache(maxsize=1024)
+def _transition(spec: TransitionSpec) -> Transition:
+    cls = _TRANSITIONS[spec.kind]
+    return cls(**{name: _from_spec(value) for name, value in spec.params})
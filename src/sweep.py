@@ -0,0 +1,147 @@
+from __future__ import annotations
+from collections import namedtuple
+from typing import Any, Callable, Iterator, Sequence
+from numpy.typing import NDArray
+import numpy as np
+
+
+class SweepSpace:
+    def __init__(self, **axes: Sequence[Any]):
+        """여러 축의 데카르트 곱을 리스트로 펼치지 않고 인덱스로 다루는 공간
+
+        `itertools.product(*axes.values())`의 `i`번째 원소를 혼합 기수 연산으로
+        바로 계산합니다. 앞쪽 축이 가장 느리게 바뀌므로 순서는 `product`와 같습니다.
+
+        Args:
+            **axes (Sequence[Any]): 축 이름과 그 축의 값들. 인자 순서가 곧 축 순서입니다.
+        """
+        self.axes: dict[str, tuple[Any, ...]] = {
+            name: tuple(values) for name, values in axes.items()
+        }
+        self.Point = namedtuple("SweepPoint", self.axes.keys())
+
+        self._sizes = tuple(len(values) for values in self.axes.values())
+        self._strides = tuple(
+            int(np.prod(self._sizes[i + 1 :], dtype=np.int64))
+            for i in range(len(self._sizes))
+        )
+        self.size = int(np.prod(self._sizes, dtype=np.int64))
+
+        # 전체 공간의 부분집합(슬라이스, 샤드, 필터)은 전역 인덱스 목록으로 나타냅니다.
+        self.indices: range | NDArray[np.int64] = range(self.size)
+
+    @property
+    def _positions(self) -> list[dict[Any, int]]:
+        # 값이 해시 가능해야 하므로 역변환이 필요할 때 처음 만듭니다.
+        if "_positions_cache" not in self.__dict__:
+            self._positions_cache = [
+                {value: i for i, value in enumerate(values)}
+                for values in self.axes.values()
+            ]
+        return self._positions_cache
+
+    def _view(self, indices: range | NDArray[np.int64]) -> SweepSpace:
+        view = object.__new__(SweepSpace)
+        view.__dict__.update(self.__dict__)
+        view.indices = indices
+        return view
+
+    def __getstate__(self):
+        # 동적으로 만든 namedtuple 클래스는 피클할 수 없으므로 받는 쪽에서 다시 만듭니다.
+        state = self.__dict__.copy()
+        del state["Point"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.Point = namedtuple("SweepPoint", self.axes.keys())
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, key: int | slice) -> Any:
+        """`key`번째 점을 반환합니다. 슬라이스면 같은 축을 공유하는 부분 공간을 반환합니다."""
+        if isinstance(key, slice):
+            return self._view(self.indices[key])
+        return self.point(int(self.indices[key]))
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in self.indices:
+            yield self.point(int(index))
+
+    def items(self) -> Iterator[tuple[int, Any]]:
+        """`(전역 인덱스, 점)` 쌍을 차례로 반환합니다."""
+        for index in self.indices:
+            index = int(index)
+            yield index, self.point(index)
+
+    def point(self, index: int) -> Any:
+        """전체 공간에서 `index`번째 점을 O(1)에 계산합니다."""
+        if not 0 <= index < self.size:
+            raise IndexError(f"index {index} is out of range for {self.size} points")
+
+        values = []
+        for axis, size, stride in zip(self.axes.values(), self._sizes, self._strides):
+            values.append(axis[(index // stride) % size])
+        return self.Point(*values)
+
+    def index(self, *values: Any, **named: Any) -> int:
+        """점의 값들로부터 전체 공간에서의 인덱스를 계산합니다."""
+        if named:
+            values = self.Point(*values, **named)
+        if len(values) != len(self._sizes):
+            raise ValueError(f"expected {len(self._sizes)} values, got {len(values)}")
+
+        index = 0
+        for name, value, positions, stride in zip(
+            self.axes, values, self._positions, self._strides
+        ):
+            if value not in positions:
+                raise ValueError(f"{value!r} is not a value of axis {name!r}")
+            index += positions[value] * stride
+        return index
+
+    def shard(self, shard_index: int, n_shards: int) -> SweepSpace:
+        """`n_shards`개로 나눈 것 중 `shard_index`번째를 띄엄띄엄 골라 반환합니다.
+
+        비용이 비슷한 작업이 이웃하는 경우가 많아서, 연속 구간보다 고르게 나뉩니다.
+        """
+        if not 0 <= shard_index < n_shards:
+            raise ValueError(f"shard {shard_index} is out of range for {n_shards}")
+        return self[shard_index::n_shards]
+
+    def where(self, **allowed: Sequence[Any]) -> SweepSpace:
+        """축마다 허용할 값만 남긴 부분 공간을 전체를 훑지 않고 만듭니다."""
+        unknown = allowed.keys() - self.axes.keys()
+        if unknown:
+            raise ValueError(f"{sorted(unknown)} are not axes of this space")
+
+        axes_indices = []
+        for name, positions, stride in zip(self.axes, self._positions, self._strides):
+            if name in allowed:
+                picked = []
+                for value in allowed[name]:
+                    if value not in positions:
+                        raise ValueError(f"{value!r} is not a value of axis {name!r}")
+                    picked.append(positions[value])
+            else:
+                picked = range(len(positions))
+            axes_indices.append(np.asarray(picked, dtype=np.int64) * stride)
+
+        indices = np.zeros(1, dtype=np.int64)
+        for offsets in axes_indices:
+            indices = (indices[:, np.newaxis] + offsets[np.newaxis, :]).ravel()
+        indices.sort()
+
+        if not isinstance(self.indices, range) or len(self.indices) != self.size:
+            indices = np.intersect1d(indices, np.asarray(self.indices))
+        return self._view(indices)
+
+    def select(self, predicate: Callable[[Any], bool]) -> SweepSpace:
+        """`predicate`를 만족하는 점만 남긴 부분 공간을 반환합니다."""
+        indices = [index for index, point in self.items() if predicate(point)]
+        return self._view(np.asarray(indices, dtype=np.int64))
+
+    def __repr__(self):
+        axes = ", ".join(f"{name}={len(values)}" for name, values in self.axes.items())
+        return f"SweepSpace({axes}, size={len(self)})"
@@ -2,9 +2,33 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from numpy.typing import NDArray
 import numpy as np
-from typing import Generator
+from typing import Generator, Sequence
+from itertools import islice
 from enum import Enum
-from src.data.noise import NoiseGenerator
+from src.data.noise import NoiseGenerator, derive_seed
+
+
+def _check_frame_index(t: int, n_frames: int):
+    if not 0 <= t < n_frames:
+        raise IndexError(f"frame {t} is out of range for {n_frames} frames")
+
+
+def _frame_indices(frames: Sequence[int] | None, n_frames: int) -> NDArray[np.intp]:
+    if frames is None:
+        return np.arange(n_frames)
+    t = np.asarray(frames, dtype=np.intp)
+    if t.size and (t.min() < 0 or t.max() >= n_frames):
+        raise IndexError(f"frames are out of range for {n_frames} frames")
+    return t
+
+
+Region = tuple[slice, slice]
+
+
+def _region_view(
+    initial: NDArray[np.uint8], region: Region | None
+) -> NDArray[np.uint8]:
+    return initial if region is None else initial[region]
 
 
 class Transition(ABC):
@@ -13,6 +37,54 @@ class Transition(ABC):
         self, initial: NDArray[np.uint8]
     ) -> Generator[NDArray[np.uint8], None, None]: ...
 
+    @abstractmethod
+    def __len__(self) -> int:
+        """`iter`가 만드는 프레임 수"""
+
+    def frame_at(
+        self,
+        initial: NDArray[np.uint8],
+        t: int,
+        seed: np.random.SeedSequence | None = None,
+    ) -> NDArray[np.uint8]:
+        """`iter`의 `t`번째 프레임을 반환합니다.
+
+        기본 구현은 `iter`를 따라가므로, 가능하면 하위 클래스에서 닫힌 형태로 구현합니다.
+        `seed`는 전환 중에 노이즈를 새로 뽑는 전환기만 사용합니다.
+        """
+        _check_frame_index(t, len(self))
+        return next(islice(self.iter(initial), t, None))
+
+    def render(
+        self,
+        initial: NDArray[np.uint8],
+        frames: Sequence[int] | None = None,
+        out: NDArray[np.uint8] | None = None,
+        seed: np.random.SeedSequence | None = None,
+        region: Region | None = None,
+    ) -> NDArray[np.uint8]:
+        """`frames`번째 프레임들을 `(len(frames), *initial.shape)` 배열 하나에 그립니다.
+
+        Args:
+            initial (NDArray[np.uint8]): 첫 프레임
+            frames (Sequence[int] | None): 그릴 프레임 번호. 없으면 전체 프레임을 그립니다.
+            out (NDArray[np.uint8] | None): 결과를 쓸 버퍼. 없으면 새로 할당합니다.
+            seed (np.random.SeedSequence | None): 새로 뽑는 노이즈의 시드. `t`번째 프레임은
+                `derive_seed(seed, t)`로 뽑으므로 어떤 프레임을 골라 그려도 같습니다.
+                없으면 전역 난수를 차례로 씁니다.
+            region (Region | None): `(행 슬라이스, 열 슬라이스)`. 주어지면 프레임마다
+                이 영역만 그립니다. 뽑는 난수는 전체 프레임을 그릴 때와 같습니다.
+        """
+        if frames is None:
+            frames = range(len(self))
+        if out is None:
+            shape = _region_view(initial, region).shape
+            out = np.empty((len(frames), *shape), dtype=initial.dtype)
+
+        for i, t in enumerate(frames):
+            out[i] = _region_view(self.frame_at(initial, t, seed=seed), region)
+        return out
+
 
 class Direction(Enum):
     UP = (0, -1)
@@ -50,6 +122,51 @@ class LinearTransition(Transition):
             now = np.roll(a=now, shift=(self.mpf * dy, self.mpf * dx), axis=(0, 1))
             yield now
 
+    def __len__(self):
+        return self.total_frames + 1
+
+    def frame_at(
+        self,
+        initial: NDArray[np.uint8],
+        t: int,
+        seed: np.random.SeedSequence | None = None,
+    ):
+        _check_frame_index(t, len(self))
+        dx, dy = self.direction.value
+        return np.roll(
+            a=initial, shift=(t * self.mpf * dy, t * self.mpf * dx), axis=(0, 1)
+        )
+
+    def render(
+        self,
+        initial: NDArray[np.uint8],
+        frames: Sequence[int] | None = None,
+        out: NDArray[np.uint8] | None = None,
+        seed: np.random.SeedSequence | None = None,
+        region: Region | None = None,
+    ):
+        t = _frame_indices(frames, len(self))
+        height, width = initial.shape[:2]
+        if region is None:
+            region = (slice(0, height), slice(0, width))
+        rows = range(height)[region[0]]
+        cols = range(width)[region[1]]
+        if out is None:
+            shape = (len(rows), len(cols), *initial.shape[2:])
+            out = np.empty((len(t), *shape), dtype=initial.dtype)
+        if not rows or not cols:
+            return out
+
+        # t번째 프레임은 첫 프레임을 t * mpf만큼 굴린 것이므로,
+        # 2×2로 이어 붙인 첫 프레임에서 잘라 오기만 하면 됩니다.
+        dx, dy = self.direction.value
+        tiled = np.tile(initial, (2, 2) + (1,) * (initial.ndim - 2))
+        ys = (-t * self.mpf * dy) % height + rows.start
+        xs = (-t * self.mpf * dx) % width + cols.start
+        for i, (y, x) in enumerate(zip(ys, xs)):
+            out[i] = tiled[y : y + len(rows), x : x + len(cols)]
+        return out
+
 
 class NoTransition(Transition):
     def __init__(self, total_frames: int):
@@ -60,6 +177,33 @@ class NoTransition(Transition):
         for _ in range(self.total_frames):
             yield now
 
+    def __len__(self):
+        return self.total_frames
+
+    def frame_at(
+        self,
+        initial: NDArray[np.uint8],
+        t: int,
+        seed: np.random.SeedSequence | None = None,
+    ):
+        _check_frame_index(t, len(self))
+        return initial.copy()
+
+    def render(
+        self,
+        initial: NDArray[np.uint8],
+        frames: Sequence[int] | None = None,
+        out: NDArray[np.uint8] | None = None,
+        seed: np.random.SeedSequence | None = None,
+        region: Region | None = None,
+    ):
+        t = _frame_indices(frames, len(self))
+        initial = _region_view(initial, region)
+        if out is None:
+            out = np.empty((len(t), *initial.shape), dtype=initial.dtype)
+        out[...] = initial
+        return out
+
 
 class NoiseOnly(Transition):
     def __init__(
@@ -79,3 +223,61 @@ class NoiseOnly(Transition):
 
         for _ in range(self.total_frames):
             yield self.noise_generator(width=self.width, height=self.height)
+
+    def __len__(self):
+        return self.total_frames + 1
+
+    def frame_at(
+        self,
+        initial: NDArray[np.uint8],
+        t: int,
+        seed: np.random.SeedSequence | None = None,
+    ):
+        # 첫 프레임 이후는 서로 독립인 노이즈이므로 새로 뽑으면 됩니다.
+        _check_frame_index(t, len(self))
+        if t == 0:
+            return initial.copy()
+        rng = None if seed is None else np.random.default_rng(derive_seed(seed, t))
+        return self.noise_generator(width=self.width, height=self.height, rng=rng)
+
+    def render(
+        self,
+        initial: NDArray[np.uint8],
+        frames: Sequence[int] | None = None,
+        out: NDArray[np.uint8] | None = None,
+        seed: np.random.SeedSequence | None = None,
+        region: Region | None = None,
+    ):
+        if region is not None:
+            # 같은 난수를 쓰려면 노이즈는 프레임 전체를 뽑아야 합니다.
+            frames = self.render(initial, frames, seed=seed)
+            if out is None:
+                return np.ascontiguousarray(frames[(slice(None), *region)])
+            out[...] = frames[(slice(None), *region)]
+            return out
+
+        t = _frame_indices(frames, len(self))
+        if out is None:
+            out = np.empty((len(t), *initial.shape), dtype=initial.dtype)
+
+        drawn = t > 0
+        out[~drawn] = initial
+        if seed is not None:
+            # 프레임마다 `(seed, t)`로 정해지는 생성기에서 버퍼에 바로 뽑습니다.
+            for i in np.flatnonzero(drawn):
+                rng = np.random.default_rng(derive_seed(seed, int(t[i])))
+                self.noise_generator.sample(
+                    1, self.width, self.height, rng=rng, out=out[i : i + 1]
+                )
+        elif drawn.any():
+            start = int(np.argmax(drawn))
+            if drawn[start:].all():
+                # 노이즈 프레임이 연속이면 버퍼에 바로 뽑습니다.
+                self.noise_generator.sample(
+                    len(t) - start, self.width, self.height, out=out[start:]
+                )
+            else:
+                out[drawn] = self.noise_generator.sample(
+                    int(drawn.sum()), self.width, self.height
+                )
+        return out
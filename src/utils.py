@@ -1,12 +1,13 @@
 from src.config import DataGenerationConfig, Position
-from PIL import ImageFont, Image, ImageDraw
+from PIL import ImageFont
 import numpy as np
 from numpy.typing import NDArray
-from typing import Callable
 from src.data.noise import BernoulliNoise
 from src.transition import LinearTransition, NoTransition, Direction, NoiseOnly
+from src.glyph import GLYPH_CACHE, MaskROI
+from src.font import load_font, text_length
+from src.position import Bounds, CenteredPosition, UniformPosition
 from dataclasses import dataclass, asdict
-import pandas as pd
 import os
 from pathlib import Path
 
@@ -17,25 +18,14 @@ def get_sized_fonts(
     text: str | list[str],
     percent: float,
 ) -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
-    if font_path is None:
-        font = ImageFont.load_default(100)
-    else:
-        font = ImageFont.truetype(font_path, 100)
+    font = load_font(font_path, 100)
 
     if isinstance(text, str):
         text = [text]
 
-    text_width = font.getlength(max(text, key=lambda t: font.getlength(t)))
+    text_width = text_length(max(text, key=lambda t: text_length(t, font)), font)
 
-    if font_path is None:
-        new_font = ImageFont.load_default(int(100 * width * percent / text_width))
-    else:
-        new_font = ImageFont.truetype(
-            font_path,
-            int(100 * width * percent / text_width),
-        )
-
-    return new_font
+    return load_font(font_path, int(100 * width * percent / text_width))
 
 
 def load_default_data_settings() -> DataGenerationConfig:
@@ -95,21 +85,8 @@ def get_position_builder(
     font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
     width: int,
     height: int,
-) -> Callable[..., Position]:
-    text_image = Image.new("L", (width, height), 0)
-    draw = ImageDraw.Draw(text_image)
-    bbox = draw.textbbox((0, 0), text, font=font)
-
-    # 왼쪽 위를 기준으로 계산
-    x_min = -bbox[0]
-    x_max = width - bbox[2]
-    y_min = -bbox[1]
-    y_max = height - bbox[3]
-
-    return lambda: (
-        np.random.rand() * (x_max - x_min) + x_min,
-        np.random.rand() * (y_max - y_min) + y_min,
-    )
+) -> UniformPosition:
+    return UniformPosition(Bounds.from_text(text, font, width, height))
 
 
 def get_centered_position(
@@ -118,27 +95,45 @@ def get_centered_position(
     width: int,
     height: int,
 ) -> Position:
-    text_image = Image.new("L", (width, height), 0)
-    draw = ImageDraw.Draw(text_image)
-    bbox = draw.textbbox((0, 0), text, font=font)
+    return CenteredPosition.from_text(text, font, width, height).position
 
-    x = (width - (bbox[2] - bbox[0])) / 2 - bbox[0]
-    y = (height - (bbox[3] - bbox[1])) / 2 - bbox[1]
 
-    return (x, y)
+def get_text_mask(
+    position: Position,
+    width: int,
+    height: int,
+    text: str,
+    font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+) -> NDArray[np.bool_]:
+    return GLYPH_CACHE.mask(
+        position=position, width=width, height=height, text=text, font=font
+    )
 
 
-def get_text_mask(
+def get_text_roi(
     position: Position,
     width: int,
     height: int,
     text: str,
     font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
+) -> MaskROI:
+    """텍스트 마스크를 글자가 있는 사각형으로 잘라 그 위치와 함께 반환합니다."""
+    return GLYPH_CACHE.roi(
+        position=position, width=width, height=height, text=text, font=font
+    )
+
+
+def get_text_masks(
+    positions: list[Position] | NDArray[np.floating],
+    width: int,
+    height: int,
+    text: str,
+    font: ImageFont.ImageFont | ImageFont.FreeTypeFont,
 ) -> NDArray[np.bool_]:
-    mask = Image.new("L", (width, height), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.text(xy=position, text=text, font=font, fill=1)
-    return np.array(mask).astype(np.bool_)
+    """여러 위치의 텍스트 마스크를 `(N, height, width)` 배열로 반환합니다."""
+    return GLYPH_CACHE.masks(
+        positions=positions, width=width, height=height, text=text, font=font
+    )
 
 
 @dataclass
@@ -161,6 +156,8 @@ def save_metadata(
     path: str,
     metadata: Metadata,
 ):
+    import pandas as pd
+
     data = asdict(metadata)
 
     df = pd.DataFrame([data])
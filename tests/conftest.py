@@ -0,0 +1,15 @@
+import pytest
+from PIL import ImageFont
+
+
+@pytest.fixture(scope="session")
+def font_path(tmp_path_factory) -> str:
+    """Pillow 기본 폰트를 파일로 꺼낸 경로"""
+    path = tmp_path_factory.mktemp("fonts") / "default.ttf"
+    path.write_bytes(ImageFont.load_default().path.getvalue())
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def font(font_path) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(font_path, 20)
@@ -0,0 +1,63 @@
+import shutil
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from src.atlas import GlyphAtlas, expand_charset, save_atlas
+from src.font import load_font, text_bbox, text_length
+from src.glyph import GlyphCache
+
+W, H = 96, 64
+SIZES = (12, 30)
+
+
+@pytest.fixture
+def atlas(tmp_path, font_path) -> GlyphAtlas:
+    path = str(tmp_path / "default.atlas")
+    save_atlas(path, font_path, [(t, s) for t in "A0g1" for s in SIZES])
+    atlas = GlyphAtlas(path)
+    atlas.register(font_path)
+    return atlas
+
+
+def test_expand_charset():
+    assert expand_charset("a-c0-2_") == ["a", "b", "c", "0", "1", "2", "_"]
+
+
+def test_atlas_masks_match_image_draw(atlas, font_path):
+    cache = GlyphCache()
+    cache.attach(atlas)
+    rng = np.random.default_rng(0)
+    positions = [(0.0, 0.0), (3.0, 4.0), (5.4921875, 2.5078125), (-2.25, 7.5)]
+    positions += [tuple(map(float, p)) for p in rng.uniform(-10, 80, (30, 2))]
+
+    for size in SIZES:
+        font = load_font(font_path, size)
+        assert cache._from_atlas("A", font_path, size, (0, 0)) is not None
+        for text in ("A", "g", "1", "A0"):
+            for x, y in positions:
+                canvas = Image.new("L", (W, H), 0)
+                ImageDraw.Draw(canvas).text(xy=(x, y), text=text, font=font, fill=1)
+                np.testing.assert_array_equal(
+                    cache.mask((x, y), W, H, text, font),
+                    np.array(canvas).astype(np.bool_),
+                )
+
+
+def test_atlas_metrics_match_font(atlas, font_path):
+    for size in SIZES:
+        font = load_font(font_path, size)
+        for text in "A0g1":
+            assert text_bbox(text, font) == font.getbbox(text, "L")
+            assert text_length(text, font) == font.getlength(text)
+
+
+def test_atlas_only_serves_registered_paths(atlas, font_path, tmp_path):
+    # 파일 이름이 같아도 등록하지 않은 경로의 폰트에는 쓰지 않습니다.
+    other = tmp_path / "other" / "default.ttf"
+    other.parent.mkdir()
+    shutil.copy(font_path, other)
+    assert atlas.covers(font_path)
+    assert not atlas.covers(str(other))
+
+    with pytest.raises(ValueError):
+        atlas.register(str(tmp_path / "malgun.ttf"))
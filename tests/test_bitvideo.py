@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from src.data.bitvideo import BitVideo, load_bits, save_bits
+from src.data.encoder import get_encoder
+
+
+@pytest.fixture
+def frames() -> np.ndarray:
+    # 픽셀 수가 8의 배수가 아니어도 프레임마다 따로 묶어 풉니다.
+    bits = np.random.default_rng(0).random((7, 13, 21)) < 0.3
+    return bits.astype(np.uint8) * 255
+
+
+def test_round_trip(tmp_path, frames):
+    path = str(tmp_path / "video.bits")
+    save_bits(path, frames, fps=12, metadata={"label": "A", "seed": 3})
+
+    np.testing.assert_array_equal(load_bits(path), frames)
+    video = BitVideo(path)
+    assert len(video) == len(frames)
+    assert video.fps == 12
+    assert video.metadata == {"label": "A", "seed": 3}
+    np.testing.assert_array_equal(video[4], frames[4])
+    np.testing.assert_array_equal(video.frames([6, 0, 2]), frames[[6, 0, 2]])
+    np.testing.assert_array_equal(video.frames(slice(1, 5)), frames[1:5])
+
+
+def test_color_round_trip(tmp_path, frames):
+    color = np.stack([frames, frames[:, ::-1], 255 - frames], axis=-1)
+    path = str(tmp_path / "color.bits")
+    get_encoder("bits").write(path, color, fps=10)
+    np.testing.assert_array_equal(load_bits(path), color)
+
+
+def test_rejects_non_binary_frames(tmp_path, frames):
+    frames[0, 0, 0] = 128
+    with pytest.raises(ValueError):
+        save_bits(str(tmp_path / "video.bits"), frames, fps=10)
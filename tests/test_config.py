@@ -0,0 +1,45 @@
+import numpy as np
+from src.config import DataGenerationConfig
+from src.data.generator import DataGenerator
+from src.data.noise import BernoulliNoise
+from src.transition import Direction, LinearTransition, NoiseOnly, NoTransition
+
+
+def _config(font) -> DataGenerationConfig:
+    noise = BernoulliNoise(0.8)
+    return DataGenerationConfig(
+        text=["a", "b"],
+        font=font,
+        text_position=(5, 5),
+        n_position_sample=1,
+        noise_generator=noise,
+        text_transition=NoTransition(6),
+        background_transition=[
+            NoiseOnly(noise, 5, 48, 32),
+            LinearTransition(Direction.UP, 5),
+        ],
+        width=48,
+        height=32,
+        fps=6,
+        length=1,
+    )
+
+
+def test_stream_shares_background_initial_but_not_noise_frames(font):
+    tasks = list(_config(font).stream(seed=3))
+    # 0번과 2번 작업은 텍스트만 다르고 배경 전환기(NoiseOnly)가 같습니다.
+    first, second = tasks[0].build(), tasks[2].build()
+    np.testing.assert_array_equal(
+        first.background_info.initial, second.background_info.initial
+    )
+
+    a = DataGenerator.render(first)
+    b = DataGenerator.render(second)
+    assert (a[1:] == b[1:]).mean() < 0.9
+
+
+def test_stream_is_reproducible(font):
+    a = [DataGenerator.render(t.build()) for t in _config(font).stream(seed=3)]
+    b = [DataGenerator.render(t.build()) for t in _config(font).stream(seed=3)]
+    for x, y in zip(a, b):
+        np.testing.assert_array_equal(x, y)
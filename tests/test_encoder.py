@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+import pytest
+from src.data.encoder import get_encoder
+
+
+def _read_video(path: str) -> np.ndarray:
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return np.stack(frames)
+
+
+def _write(tmp_path, name: str, frames: np.ndarray) -> str:
+    encoder = get_encoder(name)
+    path = str(tmp_path / f"video.{encoder.extension}")
+    try:
+        encoder.write(path, frames, fps=10)
+    except RuntimeError as error:
+        pytest.skip(f"this OpenCV build cannot write {name}: {error}")
+    return path
+
+
+@pytest.fixture
+def frames() -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (6, 24, 40, 3), dtype=np.uint8)
+
+
+def test_ffv1_is_lossless(tmp_path, frames):
+    path = _write(tmp_path, "ffv1", frames)
+    np.testing.assert_array_equal(_read_video(path), frames)
+
+
+def test_ffv1_stores_grayscale_frames_as_bgr(tmp_path, frames):
+    gray = frames[..., 0]
+    path = _write(tmp_path, "ffv1", gray)
+    np.testing.assert_array_equal(_read_video(path), np.repeat(gray[..., None], 3, -1))
+
+
+def test_gray_is_lossless(tmp_path, frames):
+    gray = frames[..., 0]
+    path = _write(tmp_path, "gray", gray)
+    np.testing.assert_array_equal(_read_video(path)[..., 0], gray)
+
+
+def test_npy_is_lossless(tmp_path, frames):
+    path = _write(tmp_path, "npy", frames)
+    np.testing.assert_array_equal(np.load(path), frames)
+
+
+def test_unknown_encoder():
+    with pytest.raises(KeyError, match="unknown encoder"):
+        get_encoder("h265")
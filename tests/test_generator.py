@@ -0,0 +1,187 @@
+"""합성 결과를 처음 구현(전역 난수 + 프레임마다 `ImageDraw.text` 마스크)과 비교합니다."""
+
+from itertools import product
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from src.config import (
+    BackgroundInfo,
+    DataGenerationConfig,
+    DataInfo,
+    TextInfo,
+    VideoInfo,
+)
+from src.data.generator import DataGenerator
+from src.data.noise import BernoulliNoise, GaussianNoise
+from src.transition import Direction, LinearTransition, NoiseOnly, NoTransition
+from src.utils import get_centered_position, get_position_builder
+
+W, H = 48, 40
+
+
+def _noise(noise, width, height):
+    if isinstance(noise, BernoulliNoise):
+        return np.random.choice(
+            [0, 255], size=(height, width), p=[noise.p, 1 - noise.p]
+        ).astype(np.uint8)
+    values = np.random.normal(noise.mean, noise.std, size=(height, width, 3))
+    return np.clip(values, 0, 255).astype(np.uint8)
+
+
+def _frames(transition, initial):
+    if isinstance(transition, LinearTransition):
+        dx, dy = transition.direction.value
+        now = initial.copy()
+        yield now
+        for _ in range(transition.total_frames):
+            now = np.roll(now, (transition.mpf * dy, transition.mpf * dx), (0, 1))
+            yield now
+    elif isinstance(transition, NoTransition):
+        for _ in range(transition.total_frames):
+            yield initial.copy()
+    else:
+        yield initial.copy()
+        for _ in range(transition.total_frames):
+            yield _noise(
+                transition.noise_generator, transition.width, transition.height
+            )
+
+
+def _position_builder(text, font):
+    bbox = ImageDraw.Draw(Image.new("L", (W, H), 0)).textbbox((0, 0), text, font=font)
+    x_min, x_max = -bbox[0], W - bbox[2]
+    y_min, y_max = -bbox[1], H - bbox[3]
+    return lambda: (
+        np.random.rand() * (x_max - x_min) + x_min,
+        np.random.rand() * (y_max - y_min) + y_min,
+    )
+
+
+def _reference_build(position, n, noise, text_transitions, backgrounds, fill):
+    if callable(position):
+        positions = [position() for _ in range(n)]
+    else:
+        positions = [position] * n
+
+    texts = []
+    for transition, xy in product(text_transitions, positions):
+        if fill:
+            initial = np.zeros((H, W), dtype=np.uint8)
+        else:
+            initial = _noise(noise, W, H)
+        texts.append((xy, initial, transition))
+    background = [(_noise(noise, W, H), transition) for transition in backgrounds]
+    return [(*t, *b) for t, b in product(texts, background)]
+
+
+def _reference_render(
+    text, font, xy, text_initial, text_transition, initial, transition
+):
+    canvas = Image.new("L", (W, H), 0)
+    ImageDraw.Draw(canvas).text(xy=xy, text=text, font=font, fill=1)
+    mask = np.array(canvas).astype(np.bool_)
+
+    frames = []
+    for foreground, background in zip(
+        _frames(text_transition, text_initial), _frames(transition, initial)
+    ):
+        frame = background.copy()
+        if frame.ndim == 3 and foreground.ndim == 2:
+            foreground = cv2.cvtColor(foreground, cv2.COLOR_GRAY2BGR)
+        elif frame.ndim == 2 and foreground.ndim == 3:
+            foreground = cv2.cvtColor(foreground, cv2.COLOR_BGR2GRAY)
+        frame[mask] = foreground[mask]
+        frames.append(frame)
+    return np.stack(frames)
+
+
+SCENARIOS = {
+    "bernoulli-moving-text": dict(
+        noise=BernoulliNoise(0.8),
+        text_transitions=[LinearTransition(Direction.DOWN, 10, mpf=3)],
+        backgrounds=[NoTransition(10)],
+        position="random",
+    ),
+    "gaussian-moving-background-filled": dict(
+        noise=GaussianNoise(200, 20),
+        text_transitions=[NoTransition(10)],
+        backgrounds=[LinearTransition(Direction.UP_LEFT, 10, mpf=2)],
+        position="centered",
+        fill=True,
+    ),
+    "noise-only-background": dict(
+        noise=BernoulliNoise(0.9),
+        text_transitions=[
+            LinearTransition(Direction.UP_RIGHT, 10, mpf=7),
+            LinearTransition(Direction.LEFT, 10),
+        ],
+        backgrounds=[NoiseOnly(BernoulliNoise(0.8), 10, W, H), NoTransition(11)],
+        position="random",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", SCENARIOS)
+def test_seeded_build_matches_reference(name, font):
+    scenario = SCENARIOS[name]
+    fill = scenario.get("fill", False)
+    if scenario["position"] == "random":
+        position = get_position_builder(text="A", font=font, width=W, height=H)
+        reference_position = _position_builder("A", font)
+    else:
+        position = get_centered_position(text="A", font=font, width=W, height=H)
+        reference_position = position
+
+    config = DataGenerationConfig(
+        text="A",
+        font=font,
+        text_position=position,
+        n_position_sample=3,
+        noise_generator=scenario["noise"],
+        text_transition=scenario["text_transitions"],
+        background_transition=scenario["backgrounds"],
+        width=W,
+        height=H,
+        fps=5,
+        length=2,
+        text_fill=fill,
+    )
+    videos = [DataGenerator.render(info) for info in config.build_seeded(11)]
+
+    np.random.seed(11)
+    reference = _reference_build(
+        reference_position,
+        3,
+        scenario["noise"],
+        scenario["text_transitions"],
+        scenario["backgrounds"],
+        fill,
+    )
+    expected = [_reference_render("A", font, *task) for task in reference]
+
+    assert len(videos) == len(expected)
+    for video, frames in zip(videos, expected):
+        np.testing.assert_array_equal(video, frames)
+
+
+def test_render_mixes_channels_and_fractional_positions(font):
+    np.random.seed(3)
+    text_initial = _noise(GaussianNoise(), W, H)
+    initial = _noise(BernoulliNoise(0.5), W, H)
+    text_transition = LinearTransition(Direction.RIGHT, 10, mpf=5)
+    info = DataInfo(
+        TextInfo("Ag", font, (3.3, -2.5), text_initial, text_transition),
+        BackgroundInfo(initial, NoTransition(12)),
+        VideoInfo(W, H, 5, 2),
+    )
+    expected = _reference_render(
+        "Ag",
+        font,
+        (3.3, -2.5),
+        text_initial,
+        text_transition,
+        initial,
+        NoTransition(12),
+    )
+    np.testing.assert_array_equal(DataGenerator.render(info), expected)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from src.font import load_font
+from src.glyph import GlyphCache
+
+W, H = 96, 64
+
+
+def _reference(position, text, font) -> np.ndarray:
+    canvas = Image.new("L", (W, H), 0)
+    ImageDraw.Draw(canvas).text(xy=position, text=text, font=font, fill=1)
+    return np.array(canvas).astype(np.bool_)
+
+
+def _positions(seed: int) -> list[tuple[float, float]]:
+    # 음수와 화면 밖, 1/64 격자 경계 근처를 함께 넣습니다.
+    rng = np.random.default_rng(seed)
+    points = [tuple(map(float, p)) for p in rng.uniform(-20, 100, (40, 2))]
+    return points + [(0.0, 0.0), (3.0, 4.0), (5.4921875, 2.5078125), (-1.5, -0.25)]
+
+
+@pytest.mark.parametrize("size", [11, 24, 40])
+@pytest.mark.parametrize("text", ["A", "g", "0", "AB"])
+def test_cached_masks_match_image_draw(font_path, size, text):
+    font = load_font(font_path, size)
+    cache = GlyphCache()
+    for position in _positions(size):
+        np.testing.assert_array_equal(
+            cache.mask(position, W, H, text, font), _reference(position, text, font)
+        )
+    # 같은 위치를 다시 부르면 캐시된 마스크로도 같은 결과가 나옵니다.
+    for position in _positions(size):
+        np.testing.assert_array_equal(
+            cache.mask(position, W, H, text, font), _reference(position, text, font)
+        )
+
+
+def test_cache_is_bounded(font):
+    cache = GlyphCache(maxsize=8)
+    for position in _positions(0):
+        cache.mask(position, W, H, "A", font)
+    assert len(cache._glyphs) <= 8
@@ -0,0 +1,87 @@
+import json
+import os
+import os.path as osp
+import pytest
+from src.manifest import Manifest
+from src.runner import SweepSpec, run_sweep
+
+
+@pytest.fixture
+def spec(tmp_path, font_path) -> SweepSpec:
+    return SweepSpec(
+        name="resume",
+        axes={"label": ("0", "1"), "speed": (1, 2)},
+        fixed={
+            "n_position_sample": 2,
+            "fps": 4,
+            "length": 1,
+            "width": 32,
+            "height": 32,
+            "font_path": font_path,
+        },
+        output=str(tmp_path / "out"),
+    )
+
+
+def _run(spec, capsys, **kwargs) -> tuple[str, str]:
+    path = run_sweep(spec, max_workers=2, backend="thread", **kwargs)
+    with open(path) as f:
+        metadata = f.read()
+    return metadata, capsys.readouterr().out
+
+
+def _mtimes(directory: str) -> dict[str, int]:
+    return {
+        name: os.stat(osp.join(directory, name)).st_mtime_ns
+        for name in os.listdir(directory)
+        if osp.isdir(osp.join(directory, name))
+    }
+
+
+def test_resume_skips_completed_tasks(spec, capsys):
+    first, _ = _run(spec, capsys)
+    before = _mtimes(spec.directory)
+
+    second, out = _run(spec, capsys)
+    assert "(done: 4)" in out
+    assert second == first
+    assert _mtimes(spec.directory) == before
+
+
+def test_resume_reruns_corrupted_and_unrecorded_tasks(spec, capsys):
+    first, _ = _run(spec, capsys)
+    manifest = Manifest(spec.directory)
+
+    # 파일 하나를 망가뜨리고, 기록의 마지막 줄은 쓰다 멈춘 것처럼 자릅니다.
+    name = next(iter(manifest.entries[2]["files"]))
+    with open(osp.join(spec.directory, name), "ab") as f:
+        f.write(b"x")
+    with open(manifest.path) as f:
+        lines = f.readlines()
+    last = json.loads(lines[-1])["index"]
+    with open(manifest.path, "w") as f:
+        f.writelines(lines[:-1] + [lines[-1][:10]])
+
+    second, out = _run(spec, capsys)
+    assert f"(done: {4 - len({2, last})})" in out
+    assert second == first
+    assert Manifest(spec.directory).completed(hash=True) == {0, 1, 2, 3}
+
+
+def test_resume_reruns_tasks_of_a_changed_spec(spec, capsys):
+    _run(spec, capsys)
+    changed = SweepSpec(
+        name=spec.name,
+        axes=spec.axes,
+        fixed={**spec.fixed, "noise_level": 0.5},
+        output=spec.output,
+    )
+    metadata, out = _run(changed, capsys)
+    assert "(done: 0)" in out
+    assert "BernoulliNoise(0.5)" in metadata
+
+
+def test_restart_ignores_the_manifest(spec, capsys):
+    _run(spec, capsys)
+    _, out = _run(spec, capsys, resume=False)
+    assert "(done: 0)" in out
@@ -0,0 +1,101 @@
+import pytest
+from src.runner import Shard, SweepSpec, merge_shards, run_sweep
+
+
+@pytest.fixture
+def spec(tmp_path, font_path) -> SweepSpec:
+    return SweepSpec(
+        name="sharded",
+        axes={"label": ("0", "1", "A"), "speed": (1, 3)},
+        fixed={
+            "n_position_sample": 1,
+            "fps": 4,
+            "length": 1,
+            "width": 32,
+            "height": 32,
+            "font_path": font_path,
+        },
+        output=str(tmp_path / "out"),
+    )
+
+
+def _read(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+def test_parse():
+    assert Shard.parse("3/16") == Shard(3, 16)
+    assert str(Shard(3, 16)) == "00003-of-00016"
+    for text in ("16/16", "-1/4", "3", "a/b"):
+        with pytest.raises(ValueError):
+            Shard.parse(text)
+
+
+@pytest.mark.parametrize(
+    "env, shard",
+    [
+        ({"SLURM_ARRAY_TASK_ID": "2", "SLURM_ARRAY_TASK_COUNT": "4"}, Shard(2, 4)),
+        (
+            {
+                "SLURM_ARRAY_TASK_ID": "5",
+                "SLURM_ARRAY_TASK_MIN": "1",
+                "SLURM_ARRAY_TASK_MAX": "8",
+            },
+            Shard(4, 8),
+        ),
+        ({}, None),
+    ],
+)
+def test_from_slurm(monkeypatch, env, shard):
+    for name in ("ID", "MIN", "MAX", "COUNT"):
+        monkeypatch.delenv(f"SLURM_ARRAY_TASK_{name}", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert Shard.from_slurm() == shard
+
+
+@pytest.mark.parametrize(
+    "env",
+    [
+        {"SLURM_ARRAY_TASK_ID": "1"},
+        {"SLURM_ARRAY_TASK_ID": "x", "SLURM_ARRAY_TASK_COUNT": "4"},
+        # --array=0-15:2처럼 띄엄띄엄한 배열
+        {
+            "SLURM_ARRAY_TASK_ID": "2",
+            "SLURM_ARRAY_TASK_MIN": "0",
+            "SLURM_ARRAY_TASK_MAX": "14",
+            "SLURM_ARRAY_TASK_COUNT": "8",
+        },
+        {"SLURM_ARRAY_TASK_ID": "4", "SLURM_ARRAY_TASK_COUNT": "4"},
+    ],
+)
+def test_from_slurm_rejects_bad_arrays(monkeypatch, env):
+    for name in ("ID", "MIN", "MAX", "COUNT"):
+        monkeypatch.delenv(f"SLURM_ARRAY_TASK_{name}", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError):
+        Shard.from_slurm()
+
+
+def test_merge_matches_a_single_run(spec, tmp_path):
+    for index in range(3):
+        run_sweep(spec, max_workers=1, backend="thread", shard=Shard(index, 3))
+    merged = _read(merge_shards(spec, verify=True))
+
+    single = SweepSpec(
+        name=spec.name,
+        axes=spec.axes,
+        fixed=spec.fixed,
+        output=str(tmp_path / "single"),
+    )
+    expected = _read(run_sweep(single, max_workers=1, backend="thread"))
+    assert merged == expected.replace(single.directory, spec.directory)
+
+
+def test_merge_rejects_incomplete_shards(spec):
+    run_sweep(spec, max_workers=1, backend="thread", shard=Shard(0, 3))
+    run_sweep(spec, max_workers=1, backend="thread", shard=Shard(2, 3))
+    with pytest.raises(ValueError, match="2 of 6 tasks are not finished"):
+        merge_shards(spec)
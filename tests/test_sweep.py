@@ -0,0 +1,52 @@
+from itertools import product
+import pickle
+import pytest
+from src.sweep import SweepSpace
+
+
+@pytest.fixture
+def space() -> SweepSpace:
+    return SweepSpace(label=("0", "1", "2"), speed=(1, 2), width=(32, 64, 96, 128))
+
+
+def test_point_matches_product(space):
+    assert list(space) == list(product(*space.axes.values()))
+
+
+def test_index_point_round_trip(space):
+    for index in range(space.size):
+        assert space.index(*space.point(index)) == index
+    assert space.index(label="2", speed=1, width=64) == space.size - 7
+
+
+def test_point_rejects_out_of_range(space):
+    with pytest.raises(IndexError):
+        space.point(space.size)
+
+
+def test_shards_partition_space(space):
+    shards = [space.shard(i, 5) for i in range(5)]
+    indices = sorted(index for shard in shards for index, _ in shard.items())
+    assert indices == list(range(space.size))
+
+
+def test_where_matches_select(space):
+    picked = space.where(label=("0", "2"), width=(64,))
+    expected = space.select(lambda p: p.label in ("0", "2") and p.width == 64)
+    assert list(picked.indices) == list(expected.indices)
+    # 부분 공간에서 다시 고르면 그 부분 공간 안에서만 고릅니다.
+    assert list(space.shard(0, 2).where(speed=(1,))) == [
+        point for point in space.shard(0, 2) if point.speed == 1
+    ]
+
+
+def test_where_rejects_unknown_axis_and_value(space):
+    with pytest.raises(ValueError, match="height"):
+        space.where(height=(32,))
+    with pytest.raises(ValueError, match="'3'.*'label'"):
+        space.where(label=("3",))
+
+
+def test_pickle_keeps_indices(space):
+    shard = pickle.loads(pickle.dumps(space.shard(1, 3)))
+    assert list(shard) == list(space.shard(1, 3))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from src.data.noise import BernoulliNoise, GaussianNoise
+from src.transition import Direction, LinearTransition, NoiseOnly, NoTransition
+
+W, H = 20, 12
+
+
+def _transitions():
+    return {
+        "linear": LinearTransition(Direction.UP_LEFT, 9, mpf=3),
+        "none": NoTransition(9),
+        "bernoulli": NoiseOnly(BernoulliNoise(0.7), 9, W, H),
+        "gaussian": NoiseOnly(GaussianNoise(), 9, W, H),
+    }
+
+
+@pytest.fixture(params=list(_transitions()))
+def case(request):
+    transition = _transitions()[request.param]
+    channels = (3,) if request.param == "gaussian" else ()
+    rng = np.random.default_rng(0)
+    initial = rng.integers(0, 256, (H, W, *channels), dtype=np.uint8)
+    return transition, initial
+
+
+def test_render_matches_iter_without_noise(case):
+    transition, initial = case
+    if isinstance(transition, NoiseOnly):
+        pytest.skip("NoiseOnly draws new noise on every call")
+    expected = np.stack(list(transition.iter(initial)))
+    np.testing.assert_array_equal(transition.render(initial), expected)
+
+
+def test_frames_are_random_access(case):
+    transition, initial = case
+    seed = np.random.SeedSequence(42)
+    full = transition.render(initial, seed=seed)
+    assert len(full) == len(transition)
+
+    frames = [len(transition) - 1, 0, 4, 4]
+    np.testing.assert_array_equal(
+        transition.render(initial, frames, seed=seed), full[frames]
+    )
+    for t in range(len(transition)):
+        np.testing.assert_array_equal(
+            transition.frame_at(initial, t, seed=seed), full[t]
+        )
+
+    region = (slice(2, 9), slice(5, 17))
+    np.testing.assert_array_equal(
+        transition.render(initial, frames, seed=seed, region=region),
+        full[frames][:, 2:9, 5:17],
+    )
+
+
+def test_frame_index_out_of_range(case):
+    transition, initial = case
+    with pytest.raises(IndexError):
+        transition.frame_at(initial, len(transition))
+    with pytest.raises(IndexError):
+        transition.render(initial, [len(transition)])
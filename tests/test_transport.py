@@ -0,0 +1,49 @@
+import numpy as np
+from src.config import DataGenerationConfig
+from src.data.generator import DataGenerator
+from src.data.noise import BernoulliNoise
+from src.data.shard import ShardReader
+from src.data.transport import render_tasks_to_shards
+from src.transition import Direction, LinearTransition, NoiseOnly, NoTransition
+
+
+def _config(font) -> DataGenerationConfig:
+    noise = BernoulliNoise(0.8)
+    return DataGenerationConfig(
+        text=["a", "b", "c"],
+        font=font,
+        text_position=(4, 4),
+        n_position_sample=2,
+        noise_generator=noise,
+        text_transition=LinearTransition(Direction.DOWN, 5),
+        background_transition=[NoTransition(6), NoiseOnly(noise, 5, 40, 24)],
+        width=40,
+        height=24,
+        fps=6,
+        length=1,
+    )
+
+
+def test_render_tasks_to_shards_matches_in_process_render(tmp_path, font):
+    config = _config(font)
+    directory = str(tmp_path / "shards")
+    render_tasks_to_shards(config.stream(seed=7), directory, render_workers=2)
+
+    tasks = list(config.stream(seed=7))
+    reader = ShardReader(directory)
+    assert sorted(reader) == [task.index for task in tasks]
+    for task in tasks:
+        np.testing.assert_array_equal(
+            reader[task.index], DataGenerator.render(task.build())
+        )
+        assert reader.metadata(task.index)["label"] == task.text
+
+
+def test_render_tasks_to_shards_resumes(tmp_path, font, capsys):
+    config = _config(font)
+    directory = str(tmp_path / "shards")
+    tasks = list(config.stream(seed=7))
+    render_tasks_to_shards(tasks[:4], directory, render_workers=1)
+    render_tasks_to_shards(tasks, directory, render_workers=1, prefix="rest")
+    assert "done: 4" in capsys.readouterr().out
+    assert sorted(ShardReader(directory)) == [task.index for task in tasks]
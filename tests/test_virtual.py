@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from src.data.virtual import VirtualDataset, spec_recipe
+from src.runner import SweepSpec, run_sweep
+
+
+@pytest.fixture
+def sweep(tmp_path, font_path):
+    spec = SweepSpec(
+        name="virtual",
+        axes={"label": ("0", "1")},
+        fixed={
+            "n_position_sample": 2,
+            "fps": 4,
+            "length": 1,
+            "width": 32,
+            "height": 32,
+            "font_path": font_path,
+        },
+        output=str(tmp_path / "out"),
+    )
+    return spec, run_sweep(spec, max_workers=1)
+
+
+def test_cached_video_is_read_only(sweep):
+    spec, metadata = sweep
+    cached = VirtualDataset(metadata, spec_recipe(spec), 2, cache_size=4)
+    fresh = VirtualDataset(metadata, spec_recipe(spec), 2)
+
+    video, _ = cached[3]
+    assert not video.flags.writeable
+    with pytest.raises(ValueError):
+        video[0] = 0
+
+    again, _ = cached[3]
+    np.testing.assert_array_equal(again, fresh[3][0])
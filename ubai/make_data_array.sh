@@ -0,0 +1,23 @@
+#!/bin/bash
+#SBATCH --nodes=1 
+#SBATCH --partition=gpu2 
+#SBATCH --cpus-per-task=4
+#SBATCH --array=0-15
+#SBATCH --job-name=UBAIJOB 
+#SBATCH -o ./logs/jupyter.%N.%A_%a.out  # STDOUT 
+#SBATCH -e ./logs/jupyter.%N.%A_%a.err  # STDERR
+
+# 실험 하나를 배열 작업으로 나눠 만듭니다. 각 작업은 SLURM_ARRAY_TASK_ID로 자기 몫을 고릅니다.
+#   jobid=$(sbatch --parsable ubai/make_data_array.sh scripts/direction.py)
+#   sbatch --dependency=afterok:$jobid --wrap "PYTHONPATH=. python scripts/direction.py --merge"
+# 선점되어 다시 실행된 작업은 끝난 영상을 건너뜁니다.
+
+SCRIPT=${1:-scripts/direction.py}
+
+echo "start at:" `date` 
+echo "node: $HOSTNAME" 
+echo "jobid: $SLURM_ARRAY_JOB_ID ($SLURM_ARRAY_TASK_ID / $SLURM_ARRAY_TASK_COUNT)" 
+
+export PYTHONPATH=.
+
+python $SCRIPT